@@ -11,16 +11,22 @@ class AnswerAgent(BaseAgent):
         Answers a list of questions directly using the LLM service.
         """
         self.logger.info(f"Answering {len(questions)} questions")
-        
-        results = []
-        for q in questions:
-            self.logger.info(f"Processing question: {q[:50]}...")
-            # Use self._generate to leverage BaseAgent's LLM handling
-            answer = self._generate(q)
-            results.append({
-                "question": q,
-                "answer": answer
-            })
-            
+
+        # Questions are independent; answer them concurrently, in order
+        answers = self._generate_many(questions)
+        results = [{"question": q, "answer": a} for q, a in zip(questions, answers)]
+
+        self.logger.info("Batch answering completed")
+        return results
+
+    async def arun(self, questions: List[str], provider: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Async counterpart of run.
+        """
+        self.logger.info(f"Answering {len(questions)} questions")
+
+        answers = await self._agenerate_many(questions)
+        results = [{"question": q, "answer": a} for q, a in zip(questions, answers)]
+
         self.logger.info("Batch answering completed")
         return results
@@ -1,8 +1,12 @@
 from app.utils.logger import get_logger
 from app.llm_providers.base import BaseLLM
-from typing import Optional
+from typing import AsyncGenerator, List, Optional
 
 class BaseAgent:
+    # Latency-critical agents set this to hedge default-service calls
+    # (see llm_hedging_enabled); an injected LLM is used as given
+    hedged: bool = False
+
     def __init__(self, name: str, llm: Optional[BaseLLM] = None):
         self.name = name
         self.logger = get_logger(name)
@@ -12,16 +16,54 @@ class BaseAgent:
     def set_llm(self, llm: BaseLLM):
         self.llm = llm
 
+    def _unwrap(self, result: dict) -> str:
+        if result.get("status") == "success":
+            return result["content"]
+        self.logger.error(f"LLM Provider error: {result.get('error')}")
+        return f"Error: {result.get('content')}"
+
     def _generate(self, prompt: str, **kwargs) -> str:
         """Helper to generate text using the injected LLM or default service."""
         if self.llm:
-            result = self.llm.generate(prompt, **kwargs)
-            if result.get("status") == "success":
-                return result["content"]
-            else:
-                self.logger.error(f"LLM Provider error: {result.get('error')}")
-                return f"Error: {result.get('content')}"
+            return self._unwrap(self.llm.generate(prompt, **kwargs))
         
         # Fallback to legacy service if no LLM injected
         from app.services.llm_service import ask_llm
-        return ask_llm(prompt)
+        return ask_llm(prompt, hedged=self.hedged, **kwargs)
+
+    async def _agenerate(self, prompt: str, **kwargs) -> str:
+        """Async counterpart of _generate, using the provider's native agenerate()."""
+        if self.llm:
+            return self._unwrap(await self.llm.agenerate(prompt, **kwargs))
+
+        from app.services.llm_service import aask_llm
+        return await aask_llm(prompt, hedged=self.hedged, **kwargs)
+
+    @staticmethod
+    def _unwrap_service(result: dict) -> str:
+        if result.get("status") == "success":
+            return result["content"]
+        return f"Error: {result.get('error')}"
+
+    def _generate_many(self, prompts: List[str], **kwargs) -> List[str]:
+        """Generate for several prompts concurrently; texts come back in prompt order."""
+        from app.services.llm_service import llm_service
+        results = llm_service.generate_many(prompts, llm=self.llm, hedged=self.hedged, **kwargs)
+        return [self._unwrap_service(r) for r in results]
+
+    async def _agenerate_many(self, prompts: List[str], **kwargs) -> List[str]:
+        """Async counterpart of _generate_many."""
+        from app.services.llm_service import llm_service
+        results = await llm_service.agenerate_many(prompts, llm=self.llm, hedged=self.hedged, **kwargs)
+        return [self._unwrap_service(r) for r in results]
+
+
+    async def _astream(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        """Stream text deltas from the injected LLM or the default service LLM."""
+        llm = self.llm
+        if llm is None:
+            from app.services.llm_service import llm_service
+            llm = llm_service.default_llm
+
+        async for chunk in llm.stream_generate(prompt, **kwargs):
+            yield chunk
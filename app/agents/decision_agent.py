@@ -1,20 +1,35 @@
 import json
+from typing import AsyncGenerator
 from .base_agent import BaseAgent
 from app.agents.prompts.decision_prompt import DECISION_PROMPT
 
 class DecisionAgent(BaseAgent):
+    hedged = True
+
     def __init__(self):
         super().__init__("DecisionAgent")
 
     def run(self, reasoning_map: dict) -> dict:
+        response = self._generate(self._build_prompt(reasoning_map))
+        return self._parse(response)
+
+    async def arun(self, reasoning_map: dict) -> dict:
+        response = await self._agenerate(self._build_prompt(reasoning_map))
+        return self._parse(response)
+
+    async def astream(self, reasoning_map: dict) -> AsyncGenerator[str, None]:
+        """Stream raw decision tokens; parse the joined text with _parse()."""
+        async for chunk in self._astream(self._build_prompt(reasoning_map)):
+            yield chunk
+
+    def _build_prompt(self, reasoning_map: dict) -> str:
         self.logger.info("Synthesizing final decision")
         
-        prompt = DECISION_PROMPT.format(
+        return DECISION_PROMPT.format(
             reasoning_map=json.dumps(reasoning_map, indent=2)
         )
-        
-        response = self._generate(prompt)
-        
+
+    def _parse(self, response: str) -> dict:
         try:
             import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
@@ -2,6 +2,7 @@ import json
 from typing import List, Dict, Any
 from .base_agent import BaseAgent
 from app.agents.prompts.evaluation_prompt import EVALUATION_PROMPT
+from app.config.settings import settings
 
 class EvaluationAgent(BaseAgent):
     def __init__(self):
@@ -19,16 +20,64 @@ class EvaluationAgent(BaseAgent):
                 "overall_score": 0
             }
 
+        prompts = self._build_prompts(questions, answers, strict)
+        if len(prompts) == 1:
+            return self._parse(self._generate(prompts[0]))
+        return self._merge(prompts, self._generate_many([p for p, _ in prompts]))
+
+    async def arun(self, questions: List[str], answers: List[str], strict: bool = True) -> Dict[str, Any]:
+        """
+        Async counterpart of run.
+        """
+        if len(questions) != len(answers):
+            self.logger.error("Mismatched questions and answers length")
+            return {
+                "error": "Mismatched questions and answers length",
+                "evaluation": [],
+                "overall_score": 0
+            }
+
+        prompts = self._build_prompts(questions, answers, strict)
+        if len(prompts) == 1:
+            return self._parse(await self._agenerate(prompts[0][0]))
+        return self._merge(prompts, await self._agenerate_many([p for p, _ in prompts]))
+
+    def _build_prompt(self, questions: List[str], answers: List[str], strict: bool) -> str:
         self.logger.info(f"Evaluating {len(questions)} pairs | strict={strict}")
         
-        prompt = EVALUATION_PROMPT.format(
+        return EVALUATION_PROMPT.format(
             questions=json.dumps(questions),
             answers=json.dumps(answers),
             strict=strict
         )
-        
-        response = self._generate(prompt)
-        
+
+    def _build_prompts(self, questions: List[str], answers: List[str], strict: bool) -> List[tuple]:
+        """(prompt, pair count) per chunk of evaluation_chunk_size pairs; chunks are evaluated concurrently."""
+        size = max(1, settings.evaluation_chunk_size)
+        return [
+            (self._build_prompt(questions[i:i + size], answers[i:i + size], strict), len(questions[i:i + size]))
+            for i in range(0, max(len(questions), 1), size)
+        ]
+
+    def _merge(self, prompts: List[tuple], responses: List[str]) -> Dict[str, Any]:
+        """Concatenate chunk evaluations; overall_score is the pair-weighted mean of scored chunks."""
+        evaluation, errors = [], []
+        weighted, pairs = 0.0, 0
+        for (_, count), response in zip(prompts, responses):
+            parsed = self._parse(response)
+            evaluation.extend(parsed.get("evaluation", []))
+            if parsed.get("error"):
+                errors.append(parsed["error"])
+                continue
+            weighted += float(parsed.get("overall_score", 0)) * count
+            pairs += count
+
+        merged = {"evaluation": evaluation, "overall_score": round(weighted / pairs, 2) if pairs else 0}
+        if errors:
+            merged["error"] = "; ".join(errors)
+        return merged
+
+    def _parse(self, response: str) -> Dict[str, Any]:
         try:
             # Clean response potential extra markdown
             clean_res = response.strip()
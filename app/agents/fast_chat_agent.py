@@ -0,0 +1,60 @@
+import json
+from .base_agent import BaseAgent
+from .intent_agent import IntentAgent
+from app.agents.prompts.fast_chat_prompt import FAST_CHAT_PROMPT
+from app.schemas.agent_schemas import DecisionOutput
+
+class FastChatAgent(BaseAgent):
+    """
+    Single-call chat: intent, reasoning and decision fused into one prompt.
+    Trades the depth of the layered pipeline for one LLM round trip.
+    """
+
+    hedged = True
+
+    def __init__(self):
+        super().__init__("FastChatAgent")
+
+    def run(self, question: str) -> dict:
+        self.logger.info(f"Fast decision synthesis for: {question}")
+        response = self._generate(FAST_CHAT_PROMPT.format(question=question))
+        return self._parse(response, question)
+
+    async def arun(self, question: str) -> dict:
+        self.logger.info(f"Fast decision synthesis for: {question}")
+        response = await self._agenerate(FAST_CHAT_PROMPT.format(question=question))
+        return self._parse(response, question)
+
+    def _parse(self, response: str, question: str) -> dict:
+        """Split the fused output into an intent blueprint and a DecisionOutput."""
+        intent = IntentAgent.default_blueprint(question)
+        try:
+            import re
+            json_match = re.search(r'\{.*\}', response, re.DOTALL)
+            if json_match:
+                response = json_match.group(0)
+
+            # Clean up potential control characters
+            response = re.sub(r'[\x00-\x1F\x7F-\x9F]', '', response)
+
+            data = json.loads(response)
+            intent["task_type"] = data.get("task_type") or intent["task_type"]
+            intent["decision_question"] = data.get("decision_question") or question
+            decision = DecisionOutput(**data).model_dump()
+            self.logger.info("Fast decision synthesis completed successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to parse fast decision synthesis: {e}")
+            decision = self.default_decision(response)
+
+        return {"intent": intent, "decision_output": decision}
+
+    @staticmethod
+    def default_decision(response: str) -> dict:
+        return {
+            "executive_summary": "Error parsing LLM response",
+            "final_recommendation": "Manual review required",
+            "key_rationale": [response],
+            "major_risks": ["Parsing failure"],
+            "assumptions_made": [],
+            "next_steps": ["Retry in full chat mode"]
+        }
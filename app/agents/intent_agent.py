@@ -3,6 +3,8 @@ from .base_agent import BaseAgent
 from app.agents.prompts.intent_prompt import INTENT_PROMPT
 
 class IntentAgent(BaseAgent):
+    hedged = True
+
     def __init__(self):
         super().__init__("IntentAgent")
 
@@ -12,7 +14,17 @@ class IntentAgent(BaseAgent):
         prompt = INTENT_PROMPT.format(question=question)
         
         response = self._generate(prompt)
-        
+        return self._parse(response, question)
+
+    async def arun(self, question: str) -> dict:
+        self.logger.info(f"Analyzing intent for: {question}")
+
+        prompt = INTENT_PROMPT.format(question=question)
+
+        response = await self._agenerate(prompt)
+        return self._parse(response, question)
+
+    def _parse(self, response: str, question: str) -> dict:
         try:
             # Robust JSON extraction
             import re
@@ -28,11 +40,15 @@ class IntentAgent(BaseAgent):
             return blueprint
         except Exception as e:
             self.logger.error(f"Failed to parse intent blueprint: {e}")
-            # Fallback
-            return {
-                "task_type": "unknown",
-                "decision_question": question,
-                "constraints": [],
-                "success_criteria": [],
-                "reasoning_depth": "medium"
-            }
+            return self.default_blueprint(question)
+
+    @staticmethod
+    def default_blueprint(question: str) -> dict:
+        """Fallback blueprint when intent cannot be extracted."""
+        return {
+            "task_type": "unknown",
+            "decision_question": question,
+            "constraints": [],
+            "success_criteria": [],
+            "reasoning_depth": "medium"
+        }
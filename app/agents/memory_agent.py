@@ -3,6 +3,7 @@ import re
 from typing import List, Dict, Any, Optional
 from .base_agent import BaseAgent
 from .summarization_agent import SummarizationAgent
+from ..llm_providers.ollama_context import conversation_contexts, history_digest
 from ..utils.storage import Storage
 from ..config.settings import settings
 
@@ -197,10 +198,10 @@ class MemoryAgent(BaseAgent):
         
         return f"I've noted that your {m_type.replace('_', ' ')} is {val}."
 
-    def get_contextual_history(self, user_id: str, conversation_id: str) -> str:
+    def get_contextual_history(self, user_id: str, conversation_id: str, summarize: bool = True) -> str:
         """
         Retrieves and formats conversation history for injection.
-        Handles summarization if history is too long.
+        Handles summarization if history is too long, unless summarize is False.
         """
         if not settings.memory_enabled:
             return ""
@@ -214,7 +215,7 @@ class MemoryAgent(BaseAgent):
         
         # If there's a lot of history, summarize the older parts
         summary = ""
-        if len(messages) > max_history * 2:
+        if summarize and len(messages) > max_history * 2:
             older_messages = messages[:-max_history]
             summary_content = "\n".join([f"{m['role']}: {m['content']}" for m in older_messages])
             summary = self.summarizer.run({"content": summary_content}, max_lines=5)
@@ -231,11 +232,25 @@ class MemoryAgent(BaseAgent):
         Injects memory context and runs the wrapped agent.
         Saves the interaction to storage.
         """
-        # 1. Load context
-        history_context = self.get_contextual_history(user_id, conversation_id)
-        
+        # 1. Load context. Lets Ollama continue from the previous turn's
+        # context and skip the history; when a stored context covers it, the
+        # history prompt is only a fallback, so skip the summarizer call
+        kwargs = {}
+        summarize = True
+        turn = f"\nCurrent User Message: {user_message}\n"
+        if settings.memory_enabled:
+            conversation = {
+                "id": f"{user_id}:{conversation_id}",
+                "history": history_digest(Storage.load_conversation(user_id, conversation_id)),
+                "message": user_message,
+                "turn": turn
+            }
+            kwargs["conversation"] = conversation
+            summarize = not conversation_contexts.covers(conversation["id"], conversation["history"])
+        history_context = self.get_contextual_history(user_id, conversation_id, summarize=summarize)
+
         # 2. Prepare prompt with memory
-        full_prompt = f"{history_context}\nCurrent User Message: {user_message}\n"
+        full_prompt = f"{history_context}{turn}"
         
         # 3. Store user message
         Storage.append_message(user_id, conversation_id, "user", user_message)
@@ -247,9 +262,9 @@ class MemoryAgent(BaseAgent):
         elif hasattr(agent_to_wrap, "run"):
              # For agents that take specific args, we might need more complex wrapping
              # But for a general /chat, we usually want a simple generation
-             response = self._generate(full_prompt)
+             response = self._generate(full_prompt, **kwargs)
         else:
-             response = self._generate(full_prompt)
+             response = self._generate(full_prompt, **kwargs)
 
         # 5. Store system response
         Storage.append_message(user_id, conversation_id, "assistant", response)
@@ -11,16 +11,26 @@ class QuestionGeneratorAgent(BaseAgent):
         """
         Generates conceptual questions based on a keyword.
         """
+        response = self._generate(self._build_prompt(keyword, num_questions, difficulty))
+        return self._parse(response)
+
+    async def arun(self, keyword: str, num_questions: int = 3, difficulty: str = "mixed") -> Dict[str, Any]:
+        """
+        Async counterpart of run.
+        """
+        response = await self._agenerate(self._build_prompt(keyword, num_questions, difficulty))
+        return self._parse(response)
+
+    def _build_prompt(self, keyword: str, num_questions: int, difficulty: str) -> str:
         self.logger.info(f"Generating {num_questions} {difficulty} questions for: {keyword}")
         
-        prompt = QUESTION_GENERATOR_PROMPT.format(
+        return QUESTION_GENERATOR_PROMPT.format(
             keyword=keyword,
             num_questions=num_questions,
             difficulty=difficulty
         )
-        
-        response = self._generate(prompt)
-        
+
+    def _parse(self, response: str) -> Dict[str, Any]:
         try:
             # Clean response potential extra markdown
             clean_res = response.strip()
@@ -8,6 +8,14 @@ class ReasoningAgent(BaseAgent):
         super().__init__("ReasoningAgent")
 
     def run(self, intent_blueprint: dict, research_data: Optional[dict] = None) -> dict:
+        response = self._generate(self._build_prompt(intent_blueprint, research_data))
+        return self._parse(response)
+
+    async def arun(self, intent_blueprint: dict, research_data: Optional[dict] = None) -> dict:
+        response = await self._agenerate(self._build_prompt(intent_blueprint, research_data))
+        return self._parse(response)
+
+    def _build_prompt(self, intent_blueprint: dict, research_data: Optional[dict] = None) -> str:
         self.logger.info(f"Expanding reasoning for: {intent_blueprint.get('decision_question')}")
         
         research_context = ""
@@ -23,13 +31,12 @@ SUPPORTING EVIDENCE:
 {research_data.get('supporting_evidence', [])}
 """
 
-        prompt = REASONING_PROMPT.format(
+        return REASONING_PROMPT.format(
             intent_blueprint=json.dumps(intent_blueprint, indent=2),
             research_context=research_context
         )
-        
-        response = self._generate(prompt)
-        
+
+    def _parse(self, response: str) -> dict:
         try:
             import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
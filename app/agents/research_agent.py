@@ -1,32 +1,79 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Tuple
 from .base_agent import BaseAgent
 from ..tools.wikipedia_tool import wikipedia_search
 from ..tools.duckduckgo_tool import duckduckgo_search
 import json
 from app.agents.prompts.research_prompt import RESEARCH_PROMPT
+from ..config.settings import settings
+from ..utils.deadline import remaining_time
+
+# Shared pool for source fetches; a source that overruns its budget is
+# abandoned here rather than holding up the graph
+_source_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="research")
 
 class ResearchAgent(BaseAgent):
     def __init__(self):
         super().__init__("ResearchAgent")
 
     def run(self, question: str) -> dict:
+        wiki_raw, ddg_raw, final_sources_list = self._collect(question)
+        response = self._generate(self._build_prompt(wiki_raw, ddg_raw))
+        return self._parse(response, ddg_raw, final_sources_list)
+
+    async def arun(self, question: str) -> dict:
+        # Tool clients are blocking; keep them off the event loop
+        wiki_raw, ddg_raw, final_sources_list = await asyncio.to_thread(self._collect, question)
+        response = await self._agenerate(self._build_prompt(wiki_raw, ddg_raw))
+        return self._parse(response, ddg_raw, final_sources_list)
+
+    def run_light(self, question: str) -> dict:
+        """Sources only: skip the LLM synthesis call and pass raw snippets on."""
+        return self._light_result(*self._collect(question))
+
+    async def arun_light(self, question: str) -> dict:
+        return self._light_result(*await asyncio.to_thread(self._collect, question))
+
+    def _light_result(self, wiki_raw: str, ddg_raw: str, final_sources_list: List[Dict[str, Any]]) -> dict:
+        evidence = [f"{s['title']}: {s['content'][:300]}" for s in final_sources_list if s.get("content")]
+        return {
+            "key_insights": [],
+            "market_signals": [],
+            "supporting_evidence": evidence,
+            "content": "\n".join(filter(None, [wiki_raw, ddg_raw])),
+            "sources": [{
+                "type": s["type"],
+                "title": s["title"],
+                "url": s["url"]
+            } for s in final_sources_list]
+        }
+
+    def _collect(self, question: str) -> Tuple[str, str, List[Dict[str, Any]]]:
+        """Fetch, merge and deduplicate raw sources for synthesis."""
         self.logger.info(f"🔎 Intelligent research synthesis started for: {question}")
         
-        # 1. Fetch Foundational Knowledge (Wikipedia)
-        wiki_data = {}
-        wiki_raw = ""
-        try:
-            wiki_data = wikipedia_search(question)
-            if wiki_data:
-                wiki_raw = wiki_data.get("summary", "")
-        except Exception as e:
-            self.logger.warning(f"Wiki fetch failed: {e}")
+        # 1 & 2. Fetch Foundational Knowledge (Wikipedia) and Recent
+        # Developments (DuckDuckGo) concurrently under a shared deadline,
+        # never longer than what is left of the request's own deadline
+        started = time.monotonic()
+        deadline = started + remaining_time(settings.research_total_timeout)
+        # Carry the request deadline and trace into the pool threads
+        wiki_future = _source_pool.submit(contextvars.copy_context().run, wikipedia_search, question)
+        ddg_future = _source_pool.submit(
+            contextvars.copy_context().run, duckduckgo_search, question, max_results=10
+        )
 
-        # 2. Fetch Recent Developments (DuckDuckGo)
-        ddg_data = []
-        try:
-            ddg_data = duckduckgo_search(question, max_results=10)
-        except Exception as e:
-            self.logger.warning(f"DDG fetch failed: {e}")
+        wiki_data = self._await_source(
+            "Wiki", wiki_future, min(started + settings.research_wiki_timeout, deadline)
+        ) or {}
+        wiki_raw = wiki_data.get("summary", "") if wiki_data else ""
+
+        ddg_data = self._await_source(
+            "DDG", ddg_future, min(started + settings.research_web_timeout, deadline)
+        ) or []
 
         # 3. Intelligent Merging & Deduplication
         # Combine and deduplicate by URL
@@ -66,14 +113,26 @@ class ResearchAgent(BaseAgent):
                 "url": ""
             })
 
+        return wiki_raw, ddg_raw, final_sources_list
+
+    def _await_source(self, label: str, future, deadline: float):
+        """Result of a source fetch, or None if it failed or missed its deadline."""
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            self.logger.warning(f"{label} fetch missed its deadline, dropping source")
+        except Exception as e:
+            self.logger.warning(f"{label} fetch failed: {e}")
+        return None
+
+    def _build_prompt(self, wiki_raw: str, ddg_raw: str) -> str:
         # 5. Intelligent Synthesis using LLM
-        synthesis_prompt = RESEARCH_PROMPT.format(
+        return RESEARCH_PROMPT.format(
             wiki_raw=wiki_raw or "No Wikipedia data available.",
             ddg_raw=ddg_raw or "No DuckDuckGo data available."
         )
-        
-        response = self._generate(synthesis_prompt)
-        
+
+    def _parse(self, response: str, ddg_raw: str, final_sources_list: List[Dict[str, Any]]) -> dict:
         try:
             import re
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
@@ -9,6 +9,12 @@ class SummarizationAgent(BaseAgent):
         return self._generate(question)
 
     def run(self, research_output: dict, max_lines=None):
+        return self._generate(self._build_prompt(research_output, max_lines))
+
+    async def arun(self, research_output: dict, max_lines=None):
+        return await self._agenerate(self._build_prompt(research_output, max_lines))
+
+    def _build_prompt(self, research_output: dict, max_lines=None) -> str:
         self.logger.info("✍️ Summarization started")
         content = research_output.get("content", "")
 
@@ -17,4 +23,4 @@ class SummarizationAgent(BaseAgent):
             prompt += f" in {max_lines} lines"
         prompt += f":\n\n{content}"
 
-        return self._generate(prompt)
+        return prompt
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException
+
+from ..schemas.job_schema import JobRequest, JobResult, JobStatus
+from ..services.job_manager import JobQueueFull, job_manager
+
+router = APIRouter()
+
+
+def _require(job_id: str, job):
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired")
+    return job
+
+
+@router.post("", response_model=JobStatus, status_code=202, tags=["Jobs"])
+def submit_job(req: JobRequest):
+    """Queue a research, summary or chat graph run and return its job id."""
+    try:
+        return job_manager.submit(req.mode, req.model_dump(exclude={"mode"}))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=JobStatus, tags=["Jobs"])
+def job_status(job_id: str):
+    return _require(job_id, job_manager.get(job_id))
+
+
+@router.get("/{job_id}/result", response_model=JobResult, tags=["Jobs"])
+def job_result(job_id: str):
+    job = _require(job_id, job_manager.get(job_id, include_result=True))
+    if job["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' is still {job['status']}")
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobStatus, tags=["Jobs"])
+def cancel_job(job_id: str):
+    return _require(job_id, job_manager.cancel(job_id))
@@ -1,4 +1,7 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
+from ..agents.memory_agent import MemoryAgent
+from ..llm_providers.factory import LLMFactory
 from ..schemas.memory_schema import MemoryChatRequest
 from ..services.state_manager import ConversationStateManager
 import logging
@@ -6,15 +9,16 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 state_manager = ConversationStateManager()
+memory_agent = MemoryAgent()
 
 @router.post("/chat/memory", tags=["Memory"])
-def chat_with_memory(req: MemoryChatRequest):
+async def chat_with_memory(req: MemoryChatRequest):
     """
     Unified context-aware memory endpoint.
     Handles semantic recall, memory updates, task routing, and status.
     """
     try:
-        result = state_manager.handle_message(
+        result = await state_manager.ahandle_message(
             user_id=req.user_id,
             conversation_id=req.conversation_id,
             text=req.question,
@@ -35,3 +39,17 @@ def chat_with_memory(req: MemoryChatRequest):
             "mode": "chat",
             "error": str(e)
         }
+
+
+@router.post("/chat/transcript", tags=["Memory"])
+async def chat_with_transcript(req: MemoryChatRequest):
+    """
+    Plain multi-turn chat over the stored transcript: one LLM call per turn
+    with the recent history in the prompt. On Ollama, later turns reuse the
+    previous turn's context instead of re-sending the history.
+    """
+    agent = MemoryAgent(llm=LLMFactory.create(provider=req.provider)) if req.provider else memory_agent
+    answer = await asyncio.to_thread(
+        agent.run_with_memory, req.user_id, req.conversation_id, req.question, agent
+    )
+    return {"question": req.question, "conversation_id": req.conversation_id, "answer": answer}
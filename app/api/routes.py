@@ -1,13 +1,17 @@
+import json
+
 from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from ..graphs.orchestration_graph import run_graph
+from ..graphs.orchestration_graph import arun_graph, astream_graph
 from ..agents.intent_agent import IntentAgent
 from ..agents.reasoning_agent import ReasoningAgent
 from ..agents.decision_agent import DecisionAgent
 from ..agents.terminal_agent import TerminalCommandAgent, AgentContext
 from ..schemas.agent_schemas import IntentRequest, ReasoningRequest, DecisionRequest
 from ..schemas.terminal_schema import TerminalRequest
+from ..utils.tracing import attach_trace
 
 router = APIRouter()
 
@@ -19,7 +23,13 @@ from typing import Literal, Optional
 
 class BaseRequest(BaseModel):
     question: str
-    provider: Optional[Literal["groq", "ollama"]] = None
+    provider: Optional[Literal["groq", "ollama", "fake"]] = None
+    # Overall time budget in seconds; defaults to request_deadline_seconds
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+
+class ChatRequest(BaseRequest):
+    # "fast_chat" answers in a single LLM call instead of the layered pipeline
+    mode: Literal["chat", "fast_chat"] = "chat"
 
 class SummaryRequest(BaseRequest):
     max_lines: int | None = None
@@ -30,30 +40,53 @@ class SummaryRequest(BaseRequest):
 # -----------------------------
 
 @router.post("/chat")
-def chat(req: BaseRequest):
-    return run_graph(
+async def chat(req: ChatRequest):
+    return attach_trace(await arun_graph(
         question=req.question,
-        mode="chat",
-        provider=req.provider
+        mode=req.mode,
+        provider=req.provider,
+        deadline=req.deadline_seconds
+    ))
+
+
+@router.post("/chat/stream")
+async def chat_stream(req: BaseRequest):
+    """
+    Server-Sent Events variant of /chat: stage events for intent, research
+    and reasoning, token deltas from the decision stage, then "done".
+    """
+    async def event_source():
+        try:
+            async for event in astream_graph(
+                question=req.question, provider=req.provider, deadline=req.deadline_seconds
+            ):
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
 @router.post("/intent")
-def get_intent(req: IntentRequest):
+async def get_intent(req: IntentRequest):
     agent = IntentAgent()
-    return agent.run(req.question)
+    return attach_trace(await agent.arun(req.question))
 
 
 @router.post("/reason")
-def get_reason(req: ReasoningRequest):
+async def get_reason(req: ReasoningRequest):
     agent = ReasoningAgent()
-    return agent.run(req.intent_blueprint, req.research_data)
+    return attach_trace(await agent.arun(req.intent_blueprint, req.research_data))
 
 
 @router.post("/decision")
-def get_decision(req: DecisionRequest):
+async def get_decision(req: DecisionRequest):
     agent = DecisionAgent()
-    return agent.run(req.reasoning_map)
+    return attach_trace(await agent.arun(req.reasoning_map))
 
 
 @router.post("/terminal")
@@ -68,19 +101,21 @@ def post_terminal(req: TerminalRequest):
 # -----------------------------
 
 @router.post("/research")
-def research(req: BaseRequest):
-    return run_graph(
+async def research(req: BaseRequest):
+    return attach_trace(await arun_graph(
         question=req.question,
         mode="research",
-        provider=req.provider
-    )
+        provider=req.provider,
+        deadline=req.deadline_seconds
+    ))
 
 
 @router.post("/summary")
-def summary(req: SummaryRequest):
-    return run_graph(
+async def summary(req: SummaryRequest):
+    return attach_trace(await arun_graph(
         question=req.question,
         mode="summary",
         max_lines=req.max_lines,
-        provider=req.provider
-    )
+        provider=req.provider,
+        deadline=req.deadline_seconds
+    ))
@@ -1,21 +1,194 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Literal
+from typing import Dict, List, Literal, Optional
 
 
 class Settings(BaseSettings):
     # ==================================================
     # 🔹 LLM CONFIGURATION (Production Refactored)
     # ==================================================
-    llm_provider: Literal["groq", "ollama"] = "groq"
+    llm_provider: Literal["groq", "ollama", "fake"] = "groq"
     
     # Groq Config
     groq_api_key: str = ""
     default_model: str = "llama-3.1-8b-instant"
+    # Client-side admission per model: calls over these limits queue for up
+    # to groq_max_queue_wait_seconds instead of collecting 429s. Off by
+    # default (0); set them to your plan's limits, e.g. 30 requests / 6000
+    # tokens per minute on the free tier.
+    # Token use is estimated as prompt chars / 4 plus
+    # groq_completion_token_estimate, then corrected from the response.
+    groq_requests_per_minute: int = 0
+    groq_tokens_per_minute: int = 0
+    groq_max_concurrency: int = 0
+    groq_max_queue_wait_seconds: float = 10.0
+    groq_completion_token_estimate: int = 512
 
     # Ollama Config
     ollama_base_url: str = "http://localhost:11434"
     ollama_model_name: str = "phi3:mini"
     ollama_timeout: int = 60
+    # Model residency: every request asks Ollama to keep the model loaded
+    # for ollama_keep_alive_seconds after use (-1 forever, 0 unload at once).
+    # When Ollama is the primary provider, start-up preloads the model in the
+    # background and a scheduler checks every ollama_keepalive_interval_seconds,
+    # reloading or refreshing it before it would be unloaded (0 disables).
+    # ollama_warmup_fallback also keeps it warm when Ollama is only a routing
+    # or hedging fallback, at the cost of holding the model in memory.
+    ollama_keep_alive_seconds: int = 1800
+    ollama_warmup_enabled: bool = True
+    ollama_warmup_fallback: bool = False
+    ollama_keepalive_interval_seconds: float = 300.0
+    # Conversation context reuse: callers that pass conversation=... (see
+    # MemoryAgent.run_with_memory, served by /chat/chat/transcript) get
+    # Ollama's returned context stored per conversation and sent back with
+    # only the new turn, skipping prompt processing of the history. Falls back to the full prompt when the
+    # model or history differs, and once a context exceeds
+    # ollama_context_max_tokens (keep it below the model's num_ctx).
+    ollama_context_reuse_enabled: bool = True
+    ollama_context_max_conversations: int = 256
+    ollama_context_ttl_seconds: int = 1800
+    ollama_context_max_tokens: int = 1536
+
+    # Fake provider (load tests / offline benchmarks). The same model drives
+    # app.llm_providers.fake_ollama_server. Distribution: fixed, uniform,
+    # normal or lognormal around fake_llm_latency_ms (time to first token).
+    fake_llm_model: str = "fake-1"
+    fake_llm_latency_ms: float = 300.0
+    fake_llm_jitter_ms: float = 100.0
+    fake_llm_latency_distribution: Literal["fixed", "uniform", "normal", "lognormal"] = "lognormal"
+    fake_llm_tokens_per_second: float = 60.0
+    fake_llm_error_rate: float = 0.0
+    fake_llm_seed: Optional[int] = None
+
+    # Pooled HTTP transport (shared keep-alive clients)
+    http_pool_max_connections: int = 20
+    http_pool_max_keepalive: int = 10
+    http_pool_keepalive_expiry: float = 30.0
+    http_pool_connect_timeout: float = 5.0
+
+    # Deterministic LLM response cache
+    llm_cache_enabled: bool = True
+    llm_cache_providers: List[str] = ["groq", "ollama"]
+    llm_cache_deterministic_only: bool = True
+    llm_cache_max_entries: int = 2048
+    llm_cache_ttl_seconds: int = 3600
+    llm_cache_disk_enabled: bool = False
+    llm_cache_disk_path: str = "./data/cache/llm_cache.sqlite3"
+    llm_cache_bypass_header: str = "X-LLM-Cache-Bypass"
+
+    # Health-aware routing: with no explicit model/key/URL override, calls
+    # to a provider in llm_routing_providers fail over to the others in that
+    # list, healthiest first. Each provider has a circuit breaker over its
+    # last circuit_window_size calls (within circuit_window_seconds): it
+    # opens at circuit_failure_rate once circuit_min_calls are seen (calls
+    # slower than circuit_slow_call_seconds count as failures), rejects
+    # calls for circuit_open_seconds, then closes after
+    # circuit_half_open_probes successful trial calls.
+    llm_routing_enabled: bool = True
+    llm_routing_providers: List[str] = ["groq", "ollama"]
+    circuit_window_size: int = 50
+    circuit_window_seconds: float = 120.0
+    circuit_min_calls: int = 5
+    circuit_failure_rate: float = 0.5
+    circuit_slow_call_seconds: float = 30.0
+    circuit_open_seconds: float = 30.0
+    circuit_half_open_probes: int = 2
+
+    # Hedged requests (opt-in per call / graph stage): when the primary has
+    # not answered after the llm_hedge_percentile of its recent latencies
+    # (llm_hedge_initial_delay_seconds until llm_hedge_min_samples are
+    # seen, always within the min/max bounds), the prompt also goes to
+    # llm_hedge_provider / llm_hedge_model and the first success wins.
+    llm_hedging_enabled: bool = False
+    llm_hedge_provider: str = "ollama"
+    llm_hedge_model: Optional[str] = None
+    llm_hedge_stages: List[str] = ["intent", "decision", "fast_chat"]
+    llm_hedge_percentile: float = 95.0
+    llm_hedge_initial_delay_seconds: float = 2.0
+    llm_hedge_min_delay_seconds: float = 0.5
+    llm_hedge_max_delay_seconds: float = 10.0
+    llm_hedge_min_samples: int = 20
+    llm_hedge_window_size: int = 200
+    # Threads for sync hedged calls: each holds one for its primary and one
+    # for a fired hedge until the loser finishes. Size for about twice the
+    # concurrent sync callers (server threadpool of 40 plus job workers).
+    llm_hedge_max_workers: int = 96
+
+    # Batch generation (LLMService.generate_many): calls in flight per batch.
+    # Provider rate limits still apply on top. Evaluation splits larger
+    # question sets into chunks of evaluation_chunk_size pairs, run as a batch.
+    llm_batch_max_concurrency: int = 4
+    evaluation_chunk_size: int = 5
+
+    # Single-flight coalescing of identical in-flight LLM and tool calls
+    request_coalescing_enabled: bool = True
+
+    # Chat graph: re-run research on the intent's refined question when it differs
+    chat_research_refine: bool = False
+
+    # Chat graph: route on the intent blueprint before research. Research is
+    # skipped for the listed task types / reasoning depths, reduced to raw
+    # sources (no synthesis call) for "light" depths, and reasoning is
+    # skipped for the listed depths. Research then waits for intent instead
+    # of starting alongside it, so this only pays off when most questions
+    # take the short path; off by default.
+    chat_intent_routing: bool = False
+    routing_skip_research_task_types: List[str] = ["synthesis"]
+    routing_skip_research_depths: List[str] = ["low"]
+    routing_light_research_depths: List[str] = ["medium"]
+    routing_skip_reasoning_depths: List[str] = ["low"]
+
+    # Research source fetches (seconds); slow sources are dropped
+    research_wiki_timeout: float = 6.0
+    research_web_timeout: float = 5.0
+    research_total_timeout: float = 8.0
+
+    # Research tool result cache (seconds)
+    research_cache_enabled: bool = True
+    research_cache_wiki_ttl: int = 86400
+    research_cache_web_ttl: int = 900
+    research_cache_negative_ttl: int = 120
+    research_cache_max_entries: int = 4096
+    research_cache_disk_enabled: bool = True
+    research_cache_disk_path: str = "./data/cache/research_cache.sqlite3"
+
+    # Semantic answer cache in front of the orchestration graph
+    # (Chroma collection per mode, questions embedded with Embedder)
+    semantic_cache_enabled: bool = True
+    semantic_cache_modes: List[str] = ["chat", "fast_chat"]
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_ttl_seconds: int = 3600
+    semantic_cache_persist_dir: str = "./data/cache/semantic_cache"
+    semantic_cache_prune_every: int = 500
+
+    # Background jobs (research / summary / chat graph runs off the request path)
+    jobs_max_workers: int = 4
+    jobs_max_pending: int = 100
+    jobs_result_ttl_seconds: int = 86400
+    jobs_deadline_seconds: float = 300.0
+    # Workers sharing jobs_db_path heartbeat the jobs they run; a running job
+    # whose heartbeat is older than jobs_heartbeat_stale_seconds is re-queued
+    jobs_heartbeat_interval_seconds: float = 10.0
+    jobs_heartbeat_stale_seconds: float = 60.0
+    jobs_db_path: str = "./data/jobs/jobs.sqlite3"
+
+    # Request tracing: spans for graph stages, LLM calls, tools, embeddings
+    # and vector queries, returned as a Server-Timing header. Sending the
+    # trace header also adds the spans to the response body as "_trace".
+    # Spans feed /metrics whether or not this is enabled.
+    tracing_enabled: bool = True
+    trace_body_header: str = "X-Debug-Trace"
+
+    # Record/replay cassettes for offline benchmarks. "record" appends every
+    # LLM and research tool call (request hash, latency, response) to
+    # cassette_path; "replay" serves them from there with the recorded
+    # latency times cassette_latency_scale. A strict replay fails on
+    # unrecorded calls instead of going upstream. While either is active the
+    # semantic answer cache and the research cache's disk tier are skipped.
+    cassette_mode: Literal["off", "record", "replay"] = "off"
+    cassette_path: str = "./data/cassettes/default.jsonl"
+    cassette_latency_scale: float = 1.0
+    cassette_replay_strict: bool = True
 
     # ==================================================
     # 🔹 LEGACY / OTHER CONFIG (Internal use)
@@ -33,6 +206,18 @@ class Settings(BaseSettings):
     # Timing and timeouts
     llm_timeout: int = 30
 
+    # Overall request deadline (seconds) shared out between graph stages.
+    # Shares are fractions of the total; each stage is also capped by what
+    # is left, so shares may sum to more than 1.
+    request_deadline_seconds: float = 60.0
+    graph_stage_budget_shares: Dict[str, float] = {
+        "intent": 0.25,
+        "research": 0.35,
+        "reasoning": 0.35,
+        "decision": 0.5,
+        "summary": 0.5,
+    }
+
     # ==================================================
     # 🔹 MEMORY & EVALUATION CONFIGURATION
     # ==================================================
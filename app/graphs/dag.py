@@ -0,0 +1,198 @@
+import asyncio
+import contextvars
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.deadline import Deadline
+from ..utils.logger import get_logger
+from ..utils.tracing import span
+
+logger = get_logger("dag_executor")
+
+
+@dataclass
+class Stage:
+    """
+    A node in the execution graph.
+    fn receives the dict of results produced so far (keyed by stage name)
+    and returns this stage's result. It may be sync or async.
+
+    budget_share is the fraction of the request deadline this stage may
+    use; when it runs out, fallback(results) supplies a degraded result
+    (without a fallback the timeout propagates).
+    """
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: List[str] = field(default_factory=list)
+    budget_share: Optional[float] = None
+    fallback: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+class DAGExecutor:
+    """
+    Runs stages as soon as their dependencies are satisfied, so independent
+    stages execute concurrently. Records per-stage wall-clock timings and
+    enforces per-stage budgets when a deadline is given.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        deadline: Optional[Deadline] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.stages = {s.name: s for s in stages}
+        self.deadline = deadline
+        self.max_workers = max_workers or len(stages)
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self.degraded: List[str] = []
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        # Kahn's algorithm to reject cycles up front
+        remaining = {name: set(s.deps) for name, s in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle detected between stages: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _ready(self, done: set, started: set) -> List[Stage]:
+        return [
+            s for name, s in self.stages.items()
+            if name not in started and all(d in done for d in s.deps)
+        ]
+
+    def _budget(self, stage: Stage) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return self.deadline.budget(stage.budget_share)
+
+    def _record(self, name: str, origin: float, start: float, end: float):
+        self.timings[name] = {
+            "start_ms": round((start - origin) * 1000, 2),
+            "duration_ms": round((end - start) * 1000, 2)
+        }
+
+    def _degrade(self, stage: Stage, results: Dict[str, Any], budget: Optional[float]) -> Any:
+        if stage.fallback is None:
+            raise TimeoutError(f"Stage '{stage.name}' exceeded its {budget:.2f}s budget")
+        logger.warning(f"Stage '{stage.name}' exceeded its {budget:.2f}s budget, using fallback")
+        self.degraded.append(stage.name)
+        self.timings.setdefault(stage.name, {})["degraded"] = True
+        return stage.fallback(results)
+
+    def run(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute the graph on a thread pool and return all stage results."""
+        results: Dict[str, Any] = dict(initial or {})
+        origin = time.perf_counter()
+        done, started = set(), set()
+
+        def execute(stage: Stage):
+            start = time.perf_counter()
+            try:
+                with span(f"stage.{stage.name}"):
+                    return stage.fn(results)
+            finally:
+                # A stage abandoned for its budget keeps the time it was given
+                if stage.name not in self.degraded:
+                    self._record(stage.name, origin, start, time.perf_counter())
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending: Dict[Future, Stage] = {}
+        expiries: Dict[Future, Optional[float]] = {}
+        budgets: Dict[Future, Optional[float]] = {}
+        starts: Dict[Future, float] = {}
+        try:
+            while len(done) < len(self.stages):
+                for stage in self._ready(done, started):
+                    started.add(stage.name)
+                    # Thread pools do not inherit context; carry the deadline over
+                    future = pool.submit(contextvars.copy_context().run, execute, stage)
+                    budget = self._budget(stage)
+                    pending[future] = stage
+                    starts[future] = time.perf_counter()
+                    budgets[future] = budget
+                    expiries[future] = None if budget is None else time.monotonic() + budget
+
+                limits = [e for e in expiries.values() if e is not None]
+                timeout = max(0.0, min(limits) - time.monotonic()) if limits else None
+                finished, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    stage = pending.pop(future)
+                    expiries.pop(future)
+                    budgets.pop(future)
+                    starts.pop(future)
+                    results[stage.name] = future.result()
+                    done.add(stage.name)
+
+                now = time.monotonic()
+                for future in [f for f, e in expiries.items() if e is not None and e <= now]:
+                    stage = pending.pop(future)
+                    expiries.pop(future)
+                    budget = budgets.pop(future)
+                    # The worker thread cannot be interrupted; its result is discarded
+                    self._record(stage.name, origin, starts.pop(future), time.perf_counter())
+                    results[stage.name] = self._degrade(stage, results, budget)
+                    done.add(stage.name)
+        finally:
+            pool.shutdown(wait=False)
+
+        logger.info(f"DAG completed | timings={self.timings}")
+        return results
+
+    async def arun(self, initial: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute the graph on the running event loop and return all stage results."""
+        results: Dict[str, Any] = dict(initial or {})
+        origin = time.perf_counter()
+        done, started = set(), set()
+
+        async def call(stage: Stage):
+            with span(f"stage.{stage.name}"):
+                if inspect.iscoroutinefunction(stage.fn):
+                    return await stage.fn(results)
+                return await asyncio.to_thread(stage.fn, results)
+
+        async def execute(stage: Stage):
+            budget = self._budget(stage)
+            start = time.perf_counter()
+            try:
+                return await asyncio.wait_for(call(stage), timeout=budget)
+            except asyncio.TimeoutError:
+                self._record(stage.name, origin, start, time.perf_counter())
+                return self._degrade(stage, results, budget)
+            finally:
+                if stage.name not in self.timings:
+                    self._record(stage.name, origin, start, time.perf_counter())
+
+        pending: Dict[asyncio.Task, str] = {}
+        try:
+            while len(done) < len(self.stages):
+                for stage in self._ready(done, started):
+                    started.add(stage.name)
+                    pending[asyncio.create_task(execute(stage))] = stage.name
+
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = pending.pop(task)
+                    results[name] = task.result()
+                    done.add(name)
+        finally:
+            # A failed stage aborts the run; do not leave siblings running
+            for task in pending:
+                task.cancel()
+
+        logger.info(f"DAG completed | timings={self.timings}")
+        return results
@@ -1,94 +1,628 @@
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List, Optional
 from ..agents.intent_agent import IntentAgent
 from ..agents.reasoning_agent import ReasoningAgent
 from ..agents.decision_agent import DecisionAgent
 from ..agents.research_agent import ResearchAgent
 from ..agents.summarization_agent import SummarizationAgent
+from ..agents.fast_chat_agent import FastChatAgent
 from ..utils.logger import get_logger
 from ..llm_providers.factory import LLMFactory
+from ..services.semantic_cache import semantic_cache
+from ..config.settings import settings
+from ..utils.deadline import Deadline, current_deadline, deadline_scope
+from ..utils.tracing import span
+from .dag import DAGExecutor, Stage
 
 logger = get_logger("orchestration_graph")
 
-def run_graph(question: str, mode: str, max_lines=None, provider=None):
-    logger.info(f"🧠 Graph started | mode={mode} | provider={provider}")
-    
-    # Resolve LLM for the entire graph run
-    llm = LLMFactory.create(provider=provider)
 
-    # NEW 3-Layer Architect flow for "chat" (decision-intelligence)
-    if mode == "chat":
-        intent_agent = IntentAgent()
-        intent_agent.set_llm(llm)
-        
-        research_agent = ResearchAgent()
-        research_agent.set_llm(llm)
-        
-        reasoning_agent = ReasoningAgent()
-        reasoning_agent.set_llm(llm)
-        
-        decision_agent = DecisionAgent()
-        decision_agent.set_llm(llm)
-
-        intent = intent_agent.run(question)
-        research = research_agent.run(intent.get("decision_question", question))
-        reasoning = reasoning_agent.run(intent, research_data=research)
-        decision_output = decision_agent.run(reasoning)
-
-        # ENSURE SOURCES ARE PRESENT
-        sources = research.get("sources", [])
-        if not sources:
-            logger.warning("No sources in chat mode, adding fallback")
-            sources = [{
-                "type": "web",
-                "title": f"Research: {question}",
-                "url": ""
-            }]
-
-        return {
-            "question": question,
-            "intent": intent,
-            "decision_output": decision_output,
-            "sources": sources,
-            "mode": "chat"
-        }
-
-    # LEGACY / Specialized flows
+def _fallback_sources(question: str) -> list:
+    return [{
+        "type": "web",
+        "title": f"Research: {question}",
+        "url": ""
+    }]
+
+
+def _stage_llm(provider, stage: str):
+    """The run's LLM for one stage; hedged when the stage is listed in llm_hedge_stages."""
+    return LLMFactory.create(provider=provider, hedged=stage in settings.llm_hedge_stages)
+
+
+def _build_chat_agents(provider):
+    intent_agent = IntentAgent()
+    intent_agent.set_llm(_stage_llm(provider, "intent"))
+
     research_agent = ResearchAgent()
-    research_agent.set_llm(llm)
-    
+    research_agent.set_llm(_stage_llm(provider, "research"))
+
+    reasoning_agent = ReasoningAgent()
+    reasoning_agent.set_llm(_stage_llm(provider, "reasoning"))
+
+    decision_agent = DecisionAgent()
+    decision_agent.set_llm(_stage_llm(provider, "decision"))
+
+    return intent_agent, research_agent, reasoning_agent, decision_agent
+
+
+def _refined_question(question: str, intent: dict) -> Optional[str]:
+    """The intent's decision question, when refinement is enabled and it differs from the raw one."""
+    if not settings.chat_research_refine:
+        return None
+    refined = (intent.get("decision_question") or "").strip()
+    if not refined or refined.lower() == question.strip().lower():
+        return None
+    return refined
+
+
+# -----------------------------
+# Degraded fallbacks used when a stage runs out of budget
+# -----------------------------
+
+def _no_research(reason: str) -> dict:
+    return {
+        "key_insights": [],
+        "market_signals": [],
+        "supporting_evidence": [],
+        "content": "",
+        "sources": [],
+        "skipped": reason
+    }
+
+
+def _skipped_research(r: dict) -> dict:
+    return _no_research("deadline")
+
+
+def _minimal_reasoning(r: dict) -> dict:
+    return {
+        "sub_questions": [],
+        "assumptions": [],
+        "risks": [],
+        "decision_map": r["intent"].get("decision_question", "")
+    }
+
+
+def _reasoning_only_decision(r: dict) -> dict:
+    reasoning = r.get("reasoning", {})
+    # ReasoningAgent's map; decision_map comes from its parse fallback and _minimal_reasoning
+    decision_map = reasoning.get("decision_landscape_map") or reasoning.get("decision_map", "")
+    return {
+        "executive_summary": "Time budget exhausted before final synthesis; returning the reasoning-only answer.",
+        "final_recommendation": decision_map if isinstance(decision_map, str) else str(decision_map),
+        "key_rationale": [str(q) for q in reasoning.get("sub_questions", [])],
+        "major_risks": [str(x) for x in reasoning.get("risks", [])],
+        "assumptions_made": [str(a) for a in reasoning.get("assumptions", [])],
+        "next_steps": ["Retry the request for a full decision synthesis"]
+    }
+
+
+def _shares() -> Dict[str, float]:
+    return settings.graph_stage_budget_shares
+
+
+# -----------------------------
+# Intent-driven routing
+# -----------------------------
+
+def _route(intent: dict) -> dict:
+    """Decide from the intent blueprint how much research and reasoning to run."""
+    task_type = str(intent.get("task_type") or "").strip().lower()
+    depth = str(intent.get("reasoning_depth") or "").strip().lower()
+
+    def listed(value: str, options: List[str]) -> bool:
+        return value in {o.lower() for o in options}
+
+    if listed(task_type, settings.routing_skip_research_task_types):
+        research, reason = "skip", f"task_type={task_type}"
+    elif listed(depth, settings.routing_skip_research_depths):
+        research, reason = "skip", f"reasoning_depth={depth}"
+    elif listed(depth, settings.routing_light_research_depths):
+        research, reason = "light", f"reasoning_depth={depth}"
+    else:
+        research, reason = "full", None
+
+    route = {
+        "research": research,
+        "reasoning": "skip" if listed(depth, settings.routing_skip_reasoning_depths) else "full",
+        "task_type": task_type,
+        "reasoning_depth": depth
+    }
+    if reason:
+        route["reason"] = reason
+    logger.info(f"Routing decision: {route}")
+    return route
+
+
+def _routed_research(research_agent: ResearchAgent, question: str, r: dict) -> dict:
+    mode = r["route"]["research"]
+    if mode == "skip":
+        return _no_research("routing")
+    # Intent is already known, so research the refined question directly
+    target = _refined_question(question, r["intent"]) or question
+    return research_agent.run_light(target) if mode == "light" else research_agent.run(target)
+
+
+async def _arouted_research(research_agent: ResearchAgent, question: str, r: dict) -> dict:
+    mode = r["route"]["research"]
+    if mode == "skip":
+        return _no_research("routing")
+    target = _refined_question(question, r["intent"]) or question
+    return await (research_agent.arun_light(target) if mode == "light" else research_agent.arun(target))
+
+
+def _direct_reasoning(r: dict) -> dict:
+    """Reasoning map handed straight to the decision layer when reasoning is routed out."""
+    reasoning = _minimal_reasoning(r)
+    reasoning["assumptions"] = [str(c) for c in r["intent"].get("constraints", [])]
+    research = r["research"]
+    reasoning["research_insights"] = research.get("key_insights") or research.get("supporting_evidence", [])
+    return reasoning
+
+
+def _routed_chat_stages(question: str, agents) -> List[Stage]:
+    """
+    Chat-mode DAG with intent routing: research waits for the intent
+    blueprint so it can be skipped or reduced, and reasoning can be skipped.
+    """
+    intent_agent, research_agent, reasoning_agent, decision_agent = agents
+
+    def reasoning(r):
+        if r["route"]["reasoning"] == "skip":
+            return _direct_reasoning(r)
+        return reasoning_agent.run(r["intent"], research_data=r["research"])
+
+    shares = _shares()
+    return [
+        Stage("intent", lambda r: intent_agent.run(question),
+              budget_share=shares.get("intent"),
+              fallback=lambda r: IntentAgent.default_blueprint(question)),
+        Stage("route", lambda r: _route(r["intent"]), deps=["intent"]),
+        Stage("research", lambda r: _routed_research(research_agent, question, r), deps=["intent", "route"],
+              budget_share=shares.get("research"), fallback=_skipped_research),
+        Stage("reasoning", reasoning, deps=["route", "research"],
+              budget_share=shares.get("reasoning"), fallback=_minimal_reasoning),
+        Stage("decision", lambda r: decision_agent.run(r["reasoning"]), deps=["reasoning"],
+              budget_share=shares.get("decision"), fallback=_reasoning_only_decision),
+    ]
+
+
+def _arouted_chat_stages(question: str, agents) -> List[Stage]:
+    """Async counterpart of _routed_chat_stages."""
+    intent_agent, research_agent, reasoning_agent, decision_agent = agents
+
+    async def intent(r):
+        return await intent_agent.arun(question)
+
+    async def research(r):
+        return await _arouted_research(research_agent, question, r)
+
+    async def reasoning(r):
+        if r["route"]["reasoning"] == "skip":
+            return _direct_reasoning(r)
+        return await reasoning_agent.arun(r["intent"], research_data=r["research"])
+
+    async def decision(r):
+        return await decision_agent.arun(r["reasoning"])
+
+    shares = _shares()
+    return [
+        Stage("intent", intent, budget_share=shares.get("intent"),
+              fallback=lambda r: IntentAgent.default_blueprint(question)),
+        Stage("route", lambda r: _route(r["intent"]), deps=["intent"]),
+        Stage("research", research, deps=["intent", "route"],
+              budget_share=shares.get("research"), fallback=_skipped_research),
+        Stage("reasoning", reasoning, deps=["route", "research"],
+              budget_share=shares.get("reasoning"), fallback=_minimal_reasoning),
+        Stage("decision", decision, deps=["reasoning"],
+              budget_share=shares.get("decision"), fallback=_reasoning_only_decision),
+    ]
+
+
+def _chat_stages(question: str, agents) -> List[Stage]:
+    """
+    Chat-mode DAG. Research only needs the question, so it starts on the
+    raw question alongside intent extraction instead of waiting for it.
+    """
+    if settings.chat_intent_routing:
+        return _routed_chat_stages(question, agents)
+
+    intent_agent, research_agent, reasoning_agent, decision_agent = agents
+
+    def refine(r):
+        refined = _refined_question(question, r["intent"])
+        return research_agent.run(refined) if refined else r["research"]
+
+    shares = _shares()
+    return [
+        Stage("intent", lambda r: intent_agent.run(question),
+              budget_share=shares.get("intent"),
+              fallback=lambda r: IntentAgent.default_blueprint(question)),
+        Stage("research", lambda r: research_agent.run(question),
+              budget_share=shares.get("research"), fallback=_skipped_research),
+        Stage("refined_research", refine, deps=["intent", "research"],
+              budget_share=shares.get("research"), fallback=lambda r: r["research"]),
+        Stage("reasoning", lambda r: reasoning_agent.run(r["intent"], research_data=r["refined_research"]),
+              deps=["intent", "refined_research"],
+              budget_share=shares.get("reasoning"), fallback=_minimal_reasoning),
+        Stage("decision", lambda r: decision_agent.run(r["reasoning"]), deps=["reasoning"],
+              budget_share=shares.get("decision"), fallback=_reasoning_only_decision),
+    ]
+
+
+def _achat_stages(question: str, agents) -> List[Stage]:
+    """Async counterpart of _chat_stages."""
+    if settings.chat_intent_routing:
+        return _arouted_chat_stages(question, agents)
+
+    intent_agent, research_agent, reasoning_agent, decision_agent = agents
+
+    async def intent(r):
+        return await intent_agent.arun(question)
+
+    async def research(r):
+        return await research_agent.arun(question)
+
+    async def refine(r):
+        refined = _refined_question(question, r["intent"])
+        return await research_agent.arun(refined) if refined else r["research"]
+
+    async def reasoning(r):
+        return await reasoning_agent.arun(r["intent"], research_data=r["refined_research"])
+
+    async def decision(r):
+        return await decision_agent.arun(r["reasoning"])
+
+    shares = _shares()
+    return [
+        Stage("intent", intent, budget_share=shares.get("intent"),
+              fallback=lambda r: IntentAgent.default_blueprint(question)),
+        Stage("research", research, budget_share=shares.get("research"), fallback=_skipped_research),
+        Stage("refined_research", refine, deps=["intent", "research"],
+              budget_share=shares.get("research"), fallback=lambda r: r["research"]),
+        Stage("reasoning", reasoning, deps=["intent", "refined_research"],
+              budget_share=shares.get("reasoning"), fallback=_minimal_reasoning),
+        Stage("decision", decision, deps=["reasoning"],
+              budget_share=shares.get("decision"), fallback=_reasoning_only_decision),
+    ]
+
+
+def _chat_result(question: str, intent: dict, research: dict, decision_output: dict) -> dict:
+    # ENSURE SOURCES ARE PRESENT
+    sources = research.get("sources", [])
+    # Research deliberately routed out has no sources to stand in for
+    if not sources and research.get("skipped") != "routing":
+        logger.warning("No sources in chat mode, adding fallback")
+        sources = _fallback_sources(question)
+
+    return {
+        "question": question,
+        "intent": intent,
+        "decision_output": decision_output,
+        "sources": sources,
+        "mode": "chat"
+    }
+
+
+def _build_fast_chat_agent(provider) -> FastChatAgent:
+    agent = FastChatAgent()
+    agent.set_llm(_stage_llm(provider, "fast_chat"))
+    return agent
+
+
+def _question_only_decision(intent: dict) -> dict:
+    """Degraded fast_chat answer: no model output at all, so it restates the question."""
+    question = intent["decision_question"]
+    return {
+        "executive_summary": "Time budget exhausted before an answer was generated; returning the question only.",
+        "final_recommendation": f"No answer could be generated in time for: {question}",
+        "key_rationale": [f"Decision to make: {question}"],
+        "major_risks": ["This answer was not generated by the model"],
+        "assumptions_made": [],
+        "next_steps": ["Retry the request, or use chat mode for the layered pipeline"]
+    }
+
+
+def _fast_chat_fallback(question: str):
+    # The executor lists the stage under "degraded", which also keeps it out of the semantic cache
+    def fallback(r):
+        intent = IntentAgent.default_blueprint(question)
+        return {"intent": intent, "decision_output": _question_only_decision(intent)}
+    return fallback
+
+
+def _fast_chat_stages(question: str, agent: FastChatAgent) -> List[Stage]:
+    """Single-stage DAG for fast_chat: one fused LLM call, no research."""
+    return [Stage("fast_chat", lambda r: agent.run(question), fallback=_fast_chat_fallback(question))]
+
+
+def _afast_chat_stages(question: str, agent: FastChatAgent) -> List[Stage]:
+    """Async counterpart of _fast_chat_stages."""
+    async def fast_chat(r):
+        return await agent.arun(question)
+
+    return [Stage("fast_chat", fast_chat, fallback=_fast_chat_fallback(question))]
+
+
+def _fast_chat_result(question: str, output: dict) -> dict:
+    return {
+        "question": question,
+        "intent": output["intent"],
+        "decision_output": output["decision_output"],
+        "sources": [],
+        "mode": "fast_chat"
+    }
+
+
+def _build_legacy_agents(provider):
+    research_agent = ResearchAgent()
+    research_agent.set_llm(_stage_llm(provider, "research"))
+
     summarization_agent = SummarizationAgent()
-    summarization_agent.set_llm(llm)
+    summarization_agent.set_llm(_stage_llm(provider, "summary"))
+
+    return research_agent, summarization_agent
+
+
+def _research_only_summary(r: dict) -> str:
+    content = r["research"].get("content", "")
+    return content or "Summary unavailable within the time budget."
+
+
+def _legacy_stages(question: str, agents, mode: str, max_lines=None) -> List[Stage]:
+    research_agent, summarization_agent = agents
+    shares = _shares()
+
+    stages = [
+        # RESEARCH = tools + content
+        Stage("research", lambda r: research_agent.run(question),
+              budget_share=shares.get("research"), fallback=_skipped_research),
+    ]
+    if mode != "research":
+        # SUMMARY = research + summarize
+        stages.append(Stage("summary", lambda r: summarization_agent.run(r["research"], max_lines=max_lines),
+                            deps=["research"], budget_share=shares.get("summary"),
+                            fallback=_research_only_summary))
+    return stages
+
+
+def _alegacy_stages(question: str, agents, mode: str, max_lines=None) -> List[Stage]:
+    """Async counterpart of _legacy_stages."""
+    research_agent, summarization_agent = agents
+    shares = _shares()
+
+    async def research(r):
+        return await research_agent.arun(question)
+
+    async def summary(r):
+        return await summarization_agent.arun(r["research"], max_lines=max_lines)
+
+    stages = [
+        Stage("research", research, budget_share=shares.get("research"), fallback=_skipped_research),
+    ]
+    if mode != "research":
+        stages.append(Stage("summary", summary, deps=["research"], budget_share=shares.get("summary"),
+                            fallback=_research_only_summary))
+    return stages
 
-    # RESEARCH = tools + content
-    research_output = research_agent.run(question)
-    
+
+def _validate_research(question: str, research_output: dict) -> list:
     # VALIDATE SOURCES ARE NEVER EMPTY
     sources = research_output.get("sources", [])
     if not sources:
         logger.warning("No sources in research output, adding fallback")
-        sources = [{
-            "type": "web",
-            "title": f"Research: {question}",
-            "url": ""
-        }]
+        sources = _fallback_sources(question)
         research_output["sources"] = sources
+    return sources
+
 
-    if mode == "research":
-        return {
-            "question": question,
-            "content": research_output["content"],
-            "sources": sources,
-            "mode": "research"
-        }
+def _research_result(question: str, research_output: dict, sources: list) -> dict:
+    return {
+        "question": question,
+        "content": research_output["content"],
+        "sources": sources,
+        "mode": "research"
+    }
 
-    # SUMMARY = research + summarize
-    summary = summarization_agent.run(
-        research_output,
-        max_lines=max_lines
-    )
 
+def _summary_result(question: str, summary: str, sources: list) -> dict:
     return {
         "question": question,
         "content": summary,
         "sources": sources,  # Inherit sources from research
         "mode": "summary"
     }
+
+
+def _finalize(question: str, mode: str, r: dict, executor: DAGExecutor) -> dict:
+    if mode == "chat":
+        research = r["refined_research"] if "refined_research" in r else r["research"]
+        result = _chat_result(question, r["intent"], research, r["decision"])
+        if "route" in r:
+            result["routing"] = r["route"]
+    elif mode == "fast_chat":
+        result = _fast_chat_result(question, r["fast_chat"])
+    else:
+        research_output = r["research"]
+        sources = _validate_research(question, research_output)
+        if mode == "research":
+            result = _research_result(question, research_output, sources)
+        else:
+            result = _summary_result(question, r["summary"], sources)
+
+    result["timings"] = executor.timings
+    if executor.degraded:
+        result["degraded"] = executor.degraded
+    return result
+
+
+def run_graph(question: str, mode: str, max_lines=None, provider=None, deadline=None, use_cache=True):
+    """
+    deadline: overall budget in seconds (defaults to request_deadline_seconds).
+    It is shared out between stages; a stage that overruns its share is
+    replaced by a degraded fallback and listed under "degraded".
+    use_cache: False for questions carrying per-user context, which must
+    never be served to or from other callers via the semantic cache.
+    """
+    logger.info(f"🧠 Graph started | mode={mode} | provider={provider}")
+
+    if use_cache:
+        cached = semantic_cache.lookup(question, mode, provider)
+        if cached is not None:
+            return cached
+
+    with deadline_scope(deadline or settings.request_deadline_seconds) as active:
+        # NEW 3-Layer Architect flow for "chat" (decision-intelligence)
+        if mode == "chat":
+            stages = _chat_stages(question, _build_chat_agents(provider))
+        # Single-call variant of chat: same DecisionOutput, no research
+        elif mode == "fast_chat":
+            stages = _fast_chat_stages(question, _build_fast_chat_agent(provider))
+        # LEGACY / Specialized flows
+        else:
+            stages = _legacy_stages(question, _build_legacy_agents(provider), mode, max_lines)
+
+        executor = DAGExecutor(stages, deadline=active)
+        r = executor.run()
+
+    result = _finalize(question, mode, r, executor)
+    if use_cache:
+        semantic_cache.store(question, mode, result, provider)
+    return result
+
+
+async def arun_graph(question: str, mode: str, max_lines=None, provider=None, deadline=None, use_cache=True):
+    """Async counterpart of run_graph, driven by the agents' native arun()."""
+    logger.info(f"🧠 Async graph started | mode={mode} | provider={provider}")
+
+    # Embedding and index lookups are blocking
+    if use_cache:
+        cached = await asyncio.to_thread(semantic_cache.lookup, question, mode, provider)
+        if cached is not None:
+            return cached
+
+    with deadline_scope(deadline or settings.request_deadline_seconds) as active:
+        if mode == "chat":
+            stages = _achat_stages(question, _build_chat_agents(provider))
+        elif mode == "fast_chat":
+            stages = _afast_chat_stages(question, _build_fast_chat_agent(provider))
+        else:
+            stages = _alegacy_stages(question, _build_legacy_agents(provider), mode, max_lines)
+
+        executor = DAGExecutor(stages, deadline=active)
+        r = await executor.arun()
+
+    result = _finalize(question, mode, r, executor)
+    if use_cache:
+        await asyncio.to_thread(semantic_cache.store, question, mode, result, provider)
+    return result
+
+
+async def _bounded(deadline: Deadline, stage: str, make_coro, fallback, degraded: list):
+    """Run one streaming-graph stage within its budget, or return its fallback."""
+    async def scoped():
+        # Runs in its own task context, so the deadline does not leak to the caller
+        current_deadline.set(deadline)
+        with span(f"stage.{stage}"):
+            return await make_coro()
+
+    try:
+        return await asyncio.wait_for(scoped(), timeout=deadline.budget(_shares().get(stage)))
+    except asyncio.TimeoutError:
+        logger.warning(f"Streaming stage '{stage}' exceeded its budget, using fallback")
+        degraded.append(stage)
+        return fallback()
+
+
+async def astream_graph(question: str, provider=None, deadline=None) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Streaming variant of the chat flow.
+    Yields a "stage" event as intent, route (when intent routing is on),
+    research and reasoning complete,
+    "token" events while the decision is generated, then a final "done"
+    event carrying the same payload run_graph returns. A semantic cache
+    hit yields only the "done" event.
+    """
+    logger.info(f"🧠 Streaming graph started | provider={provider}")
+
+    cached = await asyncio.to_thread(semantic_cache.lookup, question, "chat", provider)
+    if cached is not None:
+        yield {"event": "done", "data": cached}
+        return
+
+    intent_agent, research_agent, reasoning_agent, decision_agent = _build_chat_agents(provider)
+    active = Deadline(deadline or settings.request_deadline_seconds)
+    degraded: List[str] = []
+    r: Dict[str, Any] = {}
+
+    routing = settings.chat_intent_routing
+
+    # Without routing, research starts on the raw question while intent is extracted
+    research_task = None
+    if not routing:
+        research_task = asyncio.create_task(_bounded(
+            active, "research", lambda: research_agent.arun(question), lambda: _skipped_research(r), degraded
+        ))
+    try:
+        r["intent"] = await _bounded(
+            active, "intent", lambda: intent_agent.arun(question),
+            lambda: IntentAgent.default_blueprint(question), degraded
+        )
+        yield {"event": "stage", "data": {"stage": "intent", "result": r["intent"]}}
+
+        if routing:
+            r["route"] = _route(r["intent"])
+            yield {"event": "stage", "data": {"stage": "route", "result": r["route"]}}
+            r["research"] = await _bounded(
+                active, "research", lambda: _arouted_research(research_agent, question, r),
+                lambda: _skipped_research(r), degraded
+            )
+        else:
+            r["research"] = await research_task
+            refined = _refined_question(question, r["intent"])
+            if refined:
+                r["research"] = await _bounded(
+                    active, "research", lambda: research_agent.arun(refined), lambda: r["research"], degraded
+                )
+    finally:
+        # A disconnect (GeneratorExit at a yield) or failure must not leave research running
+        if research_task is not None and not research_task.done():
+            research_task.cancel()
+    yield {"event": "stage", "data": {"stage": "research", "result": r["research"]}}
+
+    if routing and r["route"]["reasoning"] == "skip":
+        r["reasoning"] = _direct_reasoning(r)
+    else:
+        r["reasoning"] = await _bounded(
+            active, "reasoning", lambda: reasoning_agent.arun(r["intent"], research_data=r["research"]),
+            lambda: _minimal_reasoning(r), degraded
+        )
+    yield {"event": "stage", "data": {"stage": "reasoning", "result": r["reasoning"]}}
+
+    chunks = []
+    stream = decision_agent.astream(r["reasoning"])
+    try:
+        while True:
+            try:
+                delta = await asyncio.wait_for(stream.__anext__(), timeout=active.remaining())
+            except StopAsyncIteration:
+                break
+            chunks.append(delta)
+            yield {"event": "token", "data": {"delta": delta}}
+        decision_output = decision_agent._parse("".join(chunks))
+    except asyncio.TimeoutError:
+        logger.warning("Streaming decision exceeded the request deadline, using fallback")
+        degraded.append("decision")
+        decision_output = _reasoning_only_decision(r)
+    finally:
+        await stream.aclose()
+    yield {"event": "stage", "data": {"stage": "decision", "result": decision_output}}
+
+    result = _chat_result(question, r["intent"], r["research"], decision_output)
+    if "route" in r:
+        result["routing"] = r["route"]
+    if degraded:
+        result["degraded"] = degraded
+    await asyncio.to_thread(semantic_cache.store, question, "chat", result, provider)
+    yield {"event": "done", "data": result}
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 
@@ -21,6 +22,19 @@ class BaseLLM(ABC):
         """
         pass
 
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute an asynchronous generation request.
+
+        Providers with a native async client override this. The default
+        offloads the sync call to a worker thread so every provider
+        satisfies the contract.
+
+        Returns:
+            Dict containing 'content', 'model', and 'status'.
+        """
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
     @abstractmethod
     def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
         """
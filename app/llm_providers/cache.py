@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from .base import BaseLLM
+from .wrapper import LLMWrapper
+from ..config.settings import settings
+from ..utils.ttl_cache import TieredTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Set per request (see main.py middleware) to skip cache reads and writes
+cache_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+def make_cache_key(provider: str, model: str, prompt: str, params: Dict[str, Any]) -> str:
+    """Stable key over (provider, model, prompt hash, generation params)."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([provider, model, prompt_hash, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(TieredTTLCache):
+    """
+    Two-tier cache for LLM results: in-process LRU with TTL, optionally
+    backed by SQLite so entries survive restarts and are shared by workers.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        disk_path: Optional[str] = None
+    ):
+        if disk_path is None and settings.llm_cache_disk_enabled:
+            disk_path = settings.llm_cache_disk_path
+        super().__init__(
+            "llm",
+            max_entries=max_entries or settings.llm_cache_max_entries,
+            default_ttl=ttl_seconds or settings.llm_cache_ttl_seconds,
+            disk_path=disk_path
+        )
+        self._stats["bypassed"] = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = super().get(key)
+        return dict(value) if value is not None else None
+
+    def record_bypass(self):
+        self._count("bypassed")
+
+
+class CachedLLM(LLMWrapper):
+    """
+    Caching decorator around a provider. Only deterministic requests
+    (temperature 0 by default) are served from or written to the cache.
+    """
+
+    def __init__(self, inner: BaseLLM, provider: str, cache: ResponseCache):
+        super().__init__(inner, provider)
+        self.cache = cache
+
+    def _cache_key(self, prompt: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        if cache_bypass.get():
+            self.cache.record_bypass()
+            return None
+        temperature = kwargs.get("temperature", 0.7)
+        if settings.llm_cache_deterministic_only and temperature != 0:
+            return None
+        model = getattr(self.inner, "model", "")
+        return make_cache_key(self.provider, model, prompt, kwargs)
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        key = self._cache_key(prompt, kwargs)
+        if key is None:
+            return self.inner.generate(prompt, **kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        result = self.inner.generate(prompt, **kwargs)
+        if result.get("status") == "success":
+            self.cache.set(key, result)
+        return result
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        key = self._cache_key(prompt, kwargs)
+        if key is None:
+            return await self.inner.agenerate(prompt, **kwargs)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        result = await self.inner.agenerate(prompt, **kwargs)
+        if result.get("status") == "success":
+            self.cache.set(key, result)
+        return result
+
+
+# Singleton instance shared by all cached providers
+response_cache = ResponseCache()
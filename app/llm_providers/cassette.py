@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Any, AsyncGenerator, Dict
+
+from .base import BaseLLM
+from .cache import make_cache_key
+from .wrapper import LLMWrapper
+from ..utils.cassette import Cassette, cassette as default_cassette
+
+
+class CassetteLLM(LLMWrapper):
+    """
+    Records provider calls to, or replays them from, the cassette.
+    Sits directly around the provider so the response cache and request
+    coalescing above it behave as they would against the network.
+    """
+
+    def __init__(self, inner: BaseLLM, provider: str, cassette: Cassette = default_cassette):
+        super().__init__(inner, provider)
+        self.cassette = cassette
+
+    def _key(self, prompt: str, kwargs: Dict[str, Any]) -> str:
+        return make_cache_key(self.provider, getattr(self.inner, "model", ""), prompt, kwargs)
+
+    def _meta(self, prompt: str) -> Dict[str, Any]:
+        # Prompts are not stored; the hash is enough to find the call again
+        return {"provider": self.provider, "model": getattr(self.inner, "model", ""), "prompt_chars": len(prompt)}
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        result = self.cassette.call(
+            "llm", self._key(prompt, kwargs),
+            lambda: self.inner.generate(prompt, **kwargs),
+            **self._meta(prompt)
+        )
+        return dict(result)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        result = await self.cassette.acall(
+            "llm", self._key(prompt, kwargs),
+            lambda: self.inner.agenerate(prompt, **kwargs),
+            **self._meta(prompt)
+        )
+        return dict(result)
+
+    async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        key = self._key(prompt, kwargs)
+
+        if self.cassette.mode == "replay":
+            hit = self.cassette.find("llm.stream", key)
+            if hit is not None:
+                chunks, delay = hit
+                # Spread the recorded duration evenly over the chunks
+                step = delay / len(chunks) if chunks else 0.0
+                for chunk in chunks:
+                    if step > 0:
+                        await asyncio.sleep(step)
+                    yield chunk
+                return
+
+        start = time.perf_counter()
+        chunks = []
+        async for chunk in self.inner.stream_generate(prompt, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        if self.cassette.mode == "record":
+            self.cassette.record(
+                "llm.stream", key, time.perf_counter() - start, chunks, **self._meta(prompt)
+            )
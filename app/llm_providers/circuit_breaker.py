@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.metrics import LLM_CIRCUIT_STATE
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Health of one provider over a rolling window of recent calls.
+
+    closed:    calls flow; the breaker opens once the window holds at least
+               circuit_min_calls and the failure rate reaches
+               circuit_failure_rate. Calls slower than
+               circuit_slow_call_seconds count as failures.
+    open:      calls are rejected without touching the provider for
+               circuit_open_seconds.
+    half_open: up to circuit_half_open_probes trial calls at a time; that
+               many successes close the breaker, any failure reopens it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        # (finished_at, ok, latency)
+        self._calls: Deque[Tuple[float, bool, float]] = deque(maxlen=settings.circuit_window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._stats = {"rejected": 0, "opened": 0}
+        LLM_CIRCUIT_STATE.labels(name).set(_STATE_VALUES[CLOSED])
+
+    # -----------------------------
+    # State
+    # -----------------------------
+
+    def _set_state(self, state: str):
+        if state == self._state:
+            return
+        logger.warning(f"Circuit {self.name}: {self._state} -> {state}")
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+        if state != HALF_OPEN:
+            self._probes_in_flight = 0
+        self._probe_successes = 0
+        LLM_CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def _prune(self, now: float):
+        horizon = now - settings.circuit_window_seconds
+        while self._calls and self._calls[0][0] < horizon:
+            self._calls.popleft()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= settings.circuit_open_seconds:
+            self._set_state(HALF_OPEN)
+
+    # -----------------------------
+    # Call protocol: allow() before, record() after
+    # -----------------------------
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now. A True in half-open takes a probe slot."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < settings.circuit_half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record(self, ok: bool, latency: float):
+        ok = ok and latency <= settings.circuit_slow_call_seconds
+        now = time.monotonic()
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not ok:
+                    self._set_state(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= settings.circuit_half_open_probes:
+                        # Start afresh; the failures that opened it are history
+                        self._calls.clear()
+                        self._set_state(CLOSED)
+                self._calls.append((now, ok, latency))
+                return
+
+            self._calls.append((now, ok, latency))
+            if self._state != CLOSED:
+                return
+            self._prune(now)
+            if len(self._calls) >= settings.circuit_min_calls and \
+                    self._failure_rate() >= settings.circuit_failure_rate:
+                self._set_state(OPEN)
+
+    def release(self):
+        """Give back a probe slot for a call that was abandoned without an outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    # -----------------------------
+    # Health
+    # -----------------------------
+
+    def _failure_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok, _ in self._calls if not ok) / len(self._calls)
+
+    def _mean_latency(self) -> Optional[float]:
+        if not self._calls:
+            return None
+        return sum(latency for _, _, latency in self._calls) / len(self._calls)
+
+    def health(self) -> Tuple[float, float]:
+        """Sort key for routing, lower is healthier: (failure rate, mean latency)."""
+        with self._lock:
+            self._prune(time.monotonic())
+            return self._failure_rate(), self._mean_latency() or 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            self._prune(time.monotonic())
+            latency = self._mean_latency()
+            return {
+                "state": self._state,
+                "window_calls": len(self._calls),
+                "failure_rate": round(self._failure_rate(), 3),
+                "mean_latency_s": round(latency, 3) if latency is not None else None,
+                **self._stats
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide breaker for a provider, shared by every router."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker(provider)
+        return breaker
+
+
+def breaker_snapshots() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
@@ -0,0 +1,32 @@
+from typing import Any, Dict
+
+from .base import BaseLLM
+from .cache import make_cache_key
+from .wrapper import LLMWrapper
+from ..utils.singleflight import SingleFlight
+
+# Shared across providers; keys already include the provider name
+llm_flight = SingleFlight("llm")
+
+
+class CoalescingLLM(LLMWrapper):
+    """
+    Collapses concurrent identical generate()/agenerate() calls into one
+    upstream request whose result is fanned out to every caller.
+    """
+
+    def __init__(self, inner: BaseLLM, provider: str, flight: SingleFlight = llm_flight):
+        super().__init__(inner, provider)
+        self.flight = flight
+
+    def _key(self, prompt: str, kwargs: Dict[str, Any]) -> str:
+        return make_cache_key(self.provider, getattr(self.inner, "model", ""), prompt, kwargs)
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        result = self.flight.do(self._key(prompt, kwargs), self.inner.generate, prompt, **kwargs)
+        # Callers may annotate their result; hand each one its own copy
+        return dict(result)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        result = await self.flight.ado(self._key(prompt, kwargs), self.inner.agenerate, prompt, **kwargs)
+        return dict(result)
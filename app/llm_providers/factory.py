@@ -1,36 +1,212 @@
+import hashlib
 import logging
-from typing import Optional, Literal
+import threading
+from typing import Dict, Optional, Literal, Tuple
 from .base import BaseLLM
+from .cache import CachedLLM, response_cache
+from .cassette import CassetteLLM
+from .coalescing import CoalescingLLM
+from .hedging import HedgedLLM
+from .router import RoutedLLM
+from .traced import TracedLLM
+from .fake_provider import FakeLLM
 from .groq_provider import GroqLLM
 from .ollama_provider import OllamaLLM
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+RegistryKey = Tuple[str, str, str, str]
+
+
 class LLMFactory:
     """
     Centralized factory for creating LLM provider instances.
     Supports default resolution from settings and runtime overrides.
+
+    Instances are cached in a process-wide registry keyed by
+    (provider, model, api_key hash, base_url) so that provider clients and
+    their connection pools are shared across requests.
+
+    With llm_routing_enabled, default-configured providers come back as a
+    RoutedLLM that fails over between llm_routing_providers. hedged=True
+    (with llm_hedging_enabled) adds a HedgedLLM racing the configured hedge
+    provider/model on slow calls.
     """
 
+    _registry: Dict[RegistryKey, BaseLLM] = {}
+    _lock = threading.Lock()
+
     @staticmethod
+    def _hash_key(api_key: Optional[str]) -> str:
+        if not api_key:
+            return ""
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def _resolve_key(
+        cls,
+        provider: str,
+        model: Optional[str],
+        api_key: Optional[str],
+        base_url: Optional[str]
+    ) -> RegistryKey:
+        # Resolve defaults up front so a settings change maps to a new entry
+        if provider == "ollama":
+            return (
+                provider,
+                model or settings.ollama_model_name,
+                "",
+                (base_url or settings.ollama_base_url).rstrip("/")
+            )
+        if provider == "fake":
+            return (provider, model or settings.fake_llm_model, "", "")
+        return (
+            provider,
+            model or settings.default_model,
+            cls._hash_key(api_key or settings.groq_api_key),
+            ""
+        )
+
+    @classmethod
     def create(
-        provider: Optional[Literal["groq", "ollama"]] = None,
+        cls,
+        provider: Optional[Literal["groq", "ollama", "fake"]] = None,
         model: Optional[str] = None,
         api_key: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        hedged: bool = False
     ) -> BaseLLM:
         """
         Create an LLM instance based on the specified provider or default settings.
+        Returns the cached instance when one already exists for the same configuration.
+        hedged is for latency-critical calls and is ignored unless hedging is enabled.
         """
         target_provider = provider or settings.llm_provider
-        
-        logger.info(f"Creating LLM provider: {target_provider}")
 
-        if target_provider == "groq":
-            return GroqLLM(api_key=api_key, model=model)
-        elif target_provider == "ollama":
-            return OllamaLLM(base_url=base_url, model=model)
-        else:
+        if target_provider not in ("groq", "ollama", "fake"):
             logger.warning(f"Unknown provider '{target_provider}'. Falling back to Groq.")
-            return GroqLLM()
+            target_provider, model, api_key, base_url = "groq", None, None, None
+
+        if hedged and settings.llm_hedging_enabled:
+            return cls._hedged(target_provider, model, api_key, base_url)
+        if cls._routable(target_provider, model, api_key, base_url):
+            return cls._router(target_provider)
+        return cls._get(target_provider, model, api_key, base_url)
+
+    @classmethod
+    def _hedged(
+        cls,
+        provider: str,
+        model: Optional[str],
+        api_key: Optional[str],
+        base_url: Optional[str]
+    ) -> BaseLLM:
+        primary_key = cls._resolve_key(provider, model, api_key, base_url)
+        hedge_key = cls._resolve_key(settings.llm_hedge_provider, settings.llm_hedge_model, None, None)
+        primary = cls.create(provider, model, api_key, base_url)
+        if hedge_key == primary_key:
+            # Identical calls would be coalesced into one; nothing to race
+            logger.warning(f"Hedge target equals primary {primary_key[:2]}; hedging skipped")
+            return primary
+
+        key = ("hedged", "/".join(primary_key[:2]) + ">" + "/".join(hedge_key[:2])) + primary_key[2:]
+        with cls._lock:
+            llm = cls._registry.get(key)
+        if llm is not None:
+            return llm
+
+        hedge = cls._get(settings.llm_hedge_provider, settings.llm_hedge_model)
+        with cls._lock:
+            return cls._registry.setdefault(key, HedgedLLM(primary, hedge))
+
+    @staticmethod
+    def _routable(
+        provider: str,
+        model: Optional[str],
+        api_key: Optional[str],
+        base_url: Optional[str]
+    ) -> bool:
+        # Explicit overrides pin one configuration; never reroute those
+        return (
+            settings.llm_routing_enabled
+            and provider in settings.llm_routing_providers
+            and len(settings.llm_routing_providers) > 1
+            and not (model or api_key or base_url)
+        )
+
+    @classmethod
+    def _router(cls, preferred: str) -> BaseLLM:
+        key = ("router", preferred, "", "")
+        with cls._lock:
+            router = cls._registry.get(key)
+        if router is not None:
+            return router
+
+        candidates = [(name, cls._get(name)) for name in settings.llm_routing_providers]
+        with cls._lock:
+            router = cls._registry.setdefault(key, RoutedLLM(candidates, preferred=preferred))
+        return router
+
+    @classmethod
+    def _get(
+        cls,
+        provider: str,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None
+    ) -> BaseLLM:
+        key = cls._resolve_key(provider, model, api_key, base_url)
+
+        with cls._lock:
+            llm = cls._registry.get(key)
+            if llm is None:
+                logger.info(f"Creating LLM provider: {provider}")
+                llm = cls._build(provider, model, api_key, base_url)
+                cls._registry[key] = llm
+            return llm
+
+    @staticmethod
+    def _build(
+        provider: str,
+        model: Optional[str],
+        api_key: Optional[str],
+        base_url: Optional[str]
+    ) -> BaseLLM:
+        if provider == "ollama":
+            llm = OllamaLLM(base_url=base_url, model=model)
+        elif provider == "fake":
+            llm = FakeLLM(model=model)
+        else:
+            llm = GroqLLM(api_key=api_key, model=model)
+
+        # Innermost: stands in for the network, below caching and coalescing
+        if settings.cassette_mode != "off":
+            llm = CassetteLLM(llm, provider=provider)
+
+        # Per-provider opt-in to the deterministic response cache
+        if settings.llm_cache_enabled and provider in settings.llm_cache_providers:
+            llm = CachedLLM(llm, provider=provider, cache=response_cache)
+
+        # Outermost, so concurrent cache misses also share one upstream call
+        if settings.request_coalescing_enabled:
+            llm = CoalescingLLM(llm, provider=provider)
+
+        # Above coalescing so every caller gets its own span; always on
+        # because the LLM latency and error metrics are fed from these spans
+        return TracedLLM(llm, provider=provider)
+
+    @classmethod
+    def invalidate(cls, provider: Optional[str] = None) -> int:
+        """
+        Drop cached instances (all, or only those of one provider).
+        Call after changing provider settings at runtime. Routers and hedged
+        pairs are always dropped too, since they hold provider instances.
+        """
+        with cls._lock:
+            keys = [k for k in cls._registry if provider is None or k[0] in (provider, "router", "hedged")]
+            for k in keys:
+                del cls._registry[k]
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached LLM provider(s)")
+        return len(keys)
@@ -0,0 +1,204 @@
+"""
+Standalone HTTP server imitating Ollama's /api/generate, /api/tags and /api/ps.
+
+Point OLLAMA_BASE_URL at it to exercise the real OllamaLLM provider (HTTP
+pool, retries, streaming) without a model:
+
+    python -m app.llm_providers.fake_ollama_server --port 11435 \\
+        --latency-ms 400 --jitter-ms 150 --distribution lognormal \\
+        --tokens-per-second 40 --error-rate 0.02
+
+--load-ms adds a cold-start delay whenever the model is not resident; a
+request's keep_alive (seconds, default 300) sets how long it stays loaded.
+--prompt-tokens-per-second charges prompt processing for the new prompt
+only; responses carry a context array that can be sent back with the next
+prompt, as with Ollama.
+"""
+import argparse
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .fake_provider import FakeBehaviour, canned_response, tokenize
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    behaviour: FakeBehaviour
+    model: str
+    load_seconds: float
+    prompt_token_seconds: float
+    # model -> wall-clock expiry (None: resident forever); shared by all handlers
+    resident: dict
+    resident_lock: threading.Lock
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _load(self, model: str, keep_alive) -> float:
+        """Make model resident for keep_alive seconds; the load time paid, in seconds."""
+        try:
+            keep_alive = float(keep_alive)
+        except (TypeError, ValueError):
+            keep_alive = 300.0
+        now = time.time()
+        with self.resident_lock:
+            expiry = self.resident.get(model, 0.0)
+            cold = model not in self.resident or (expiry is not None and expiry <= now)
+        if cold and self.load_seconds:
+            time.sleep(self.load_seconds)
+        with self.resident_lock:
+            if keep_alive == 0:
+                self.resident.pop(model, None)
+            else:
+                self.resident[model] = None if keep_alive < 0 else time.time() + keep_alive
+        return self.load_seconds if cold else 0.0
+
+    def _running_models(self) -> list:
+        now = time.time()
+        far = datetime.now(timezone.utc) + timedelta(days=365 * 100)
+        with self.resident_lock:
+            entries = [(m, e) for m, e in self.resident.items() if e is None or e > now]
+        return [{
+            "name": model,
+            "model": model,
+            "expires_at": (far if expiry is None else datetime.fromtimestamp(expiry, timezone.utc)).isoformat()
+        } for model, expiry in entries]
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.model}]})
+        elif self.path.rstrip("/") == "/api/ps":
+            self._send_json(200, {"models": self._running_models()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        model = request.get("model") or self.model
+        load_duration = int(self._load(model, request.get("keep_alive", 300)) * 1e9)
+        if not request.get("prompt"):
+            # Ollama treats an empty prompt as a load / keep-alive request
+            self._send_json(200, {
+                "model": model, "response": "", "done": True,
+                "done_reason": "load", "load_duration": load_duration
+            })
+            return
+
+        prompt_tokens = tokenize(request["prompt"])
+        content = canned_response(request["prompt"])
+        time.sleep(len(prompt_tokens) * self.prompt_token_seconds + self.behaviour.first_token_delay())
+        if self.behaviour.should_fail():
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        # Stand-in token ids: whatever context came in, then this prompt and answer
+        context = list(request.get("context") or []) + [
+            hash(token) % 32000 for token in prompt_tokens + tokenize(content)
+        ]
+        if not request.get("stream", True):
+            time.sleep(len(tokenize(content)) * self.behaviour.token_delay())
+            self._send_json(200, {
+                "model": model, "response": content, "done": True,
+                "load_duration": load_duration, "context": context
+            })
+            return
+
+        # NDJSON over chunked transfer, one line per token, like Ollama
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        delay = self.behaviour.token_delay()
+        for token in tokenize(content):
+            self._send_chunk(json.dumps({"model": model, "response": token, "done": False}).encode() + b"\n")
+            if delay:
+                time.sleep(delay)
+        self._send_chunk(json.dumps({
+            "model": model, "response": "", "done": True, "context": context
+        }).encode() + b"\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def build_server(
+    host: str, port: int, behaviour: FakeBehaviour, model: str,
+    load_ms: float = 0.0, prompt_tokens_per_second: float = 0.0
+) -> ThreadingHTTPServer:
+    handler = type("ConfiguredFakeOllamaHandler", (FakeOllamaHandler,), {
+        "behaviour": behaviour,
+        "model": model,
+        "load_seconds": max(0.0, load_ms) / 1000.0,
+        "prompt_token_seconds": 1.0 / prompt_tokens_per_second if prompt_tokens_per_second > 0 else 0.0,
+        "resident": {},
+        "resident_lock": threading.Lock()
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default=settings.ollama_model_name)
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--jitter-ms", type=float, default=None)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "normal", "lognormal"], default=None)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--load-ms", type=float, default=0.0, help="Cold-start load time when not resident")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=0.0,
+                        help="Prompt processing rate (0: free)")
+    args = parser.parse_args()
+
+    behaviour = FakeBehaviour(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    server = build_server(
+        args.host, args.port, behaviour, args.model, args.load_ms, args.prompt_tokens_per_second
+    )
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"Fake Ollama listening on http://{args.host}:{args.port} | model={args.model}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
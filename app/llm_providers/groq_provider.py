@@ -2,6 +2,8 @@ import logging
 from typing import Any, AsyncGenerator, Dict, List, Optional
 from .base import BaseLLM
 from ..config.settings import settings
+from ..utils.deadline import remaining_time
+from ..utils.rate_limiter import REJECTED_CHUNK_PREFIX, RateLimiter, RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -12,19 +14,51 @@ class GroqLLM(BaseLLM):
         self.api_key = api_key or settings.groq_api_key
         self.model = model or settings.default_model
         self.client = None
+        self.async_client = None
+        self.limiter = RateLimiter(
+            f"groq/{self.model}",
+            requests_per_minute=settings.groq_requests_per_minute,
+            tokens_per_minute=settings.groq_tokens_per_minute,
+            max_concurrency=settings.groq_max_concurrency,
+            max_wait=settings.groq_max_queue_wait_seconds
+        )
         
         if not self.api_key:
             logger.error("Groq API key is missing. GroqLLM will not function.")
             return
 
         try:
-            from groq import Groq
+            from groq import Groq, AsyncGroq
             self.client = Groq(api_key=self.api_key)
+            self.async_client = AsyncGroq(api_key=self.api_key)
         except ImportError:
             logger.error("Groq package not installed. Run 'pip install groq'.")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
 
+    def _estimate_tokens(self, prompt: str, kwargs: Dict[str, Any]) -> int:
+        completion = min(kwargs.get("max_tokens", 2048), settings.groq_completion_token_estimate)
+        return len(prompt) // 4 + completion
+
+    def _admission_wait(self) -> Optional[float]:
+        # Never queue past the request deadline
+        return remaining_time(settings.groq_max_queue_wait_seconds)
+
+    @staticmethod
+    def _used_tokens(response) -> Optional[int]:
+        return getattr(getattr(response, "usage", None), "total_tokens", None)
+
+    @staticmethod
+    def _rejected(e: RateLimitExceeded) -> Dict[str, Any]:
+        logger.warning(f"Groq call not admitted: {e}")
+        return {
+            "status": "error",
+            "content": "Groq rate limit reached",
+            "error": str(e),
+            # Refused locally; Groq itself was never called
+            "rejected": True
+        }
+
     def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
         if not self.client:
             return {
@@ -33,18 +67,24 @@ class GroqLLM(BaseLLM):
                 "error": "Missing API key or client initialization failed"
             }
 
+        tokens = self._estimate_tokens(prompt, kwargs)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=kwargs.get("temperature", 0.7),
-                max_tokens=kwargs.get("max_tokens", 2048)
-            )
+            with self.limiter.acquire(tokens, max_wait=self._admission_wait()):
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=kwargs.get("temperature", 0.7),
+                    max_tokens=kwargs.get("max_tokens", 2048),
+                    timeout=remaining_time(settings.llm_timeout)
+                )
+            self.limiter.settle(tokens, self._used_tokens(response))
             return {
                 "status": "success",
                 "content": response.choices[0].message.content,
                 "model": f"groq/{self.model}"
             }
+        except RateLimitExceeded as e:
+            return self._rejected(e)
         except Exception as e:
             logger.error(f"Groq generation failed: {e}")
             return {
@@ -53,21 +93,61 @@ class GroqLLM(BaseLLM):
                 "error": str(e)
             }
 
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        if not self.async_client:
+            return {
+                "status": "error",
+                "content": "Groq provider not configured",
+                "error": "Missing API key or client initialization failed"
+            }
+
+        tokens = self._estimate_tokens(prompt, kwargs)
+        try:
+            async with self.limiter.aacquire(tokens, max_wait=self._admission_wait()):
+                response = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=kwargs.get("temperature", 0.7),
+                    max_tokens=kwargs.get("max_tokens", 2048),
+                    timeout=remaining_time(settings.llm_timeout)
+                )
+            self.limiter.settle(tokens, self._used_tokens(response))
+            return {
+                "status": "success",
+                "content": response.choices[0].message.content,
+                "model": f"groq/{self.model}"
+            }
+        except RateLimitExceeded as e:
+            return self._rejected(e)
+        except Exception as e:
+            logger.error(f"Groq async generation failed: {e}")
+            return {
+                "status": "error",
+                "content": "Groq generation failed",
+                "error": str(e)
+            }
+
     async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
-        if not self.client:
+        if not self.async_client:
             yield "Groq provider not configured"
             return
 
         try:
-            stream = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                stream=True,
-                temperature=kwargs.get("temperature", 0.7),
-            )
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            # The concurrency slot is held until the stream is drained
+            async with self.limiter.aacquire(self._estimate_tokens(prompt, kwargs), max_wait=self._admission_wait()):
+                stream = await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True,
+                    temperature=kwargs.get("temperature", 0.7),
+                    timeout=remaining_time(settings.llm_timeout)
+                )
+                async for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except RateLimitExceeded as e:
+            logger.warning(f"Groq stream not admitted: {e}")
+            yield f"{REJECTED_CHUNK_PREFIX}: {str(e)}"
         except Exception as e:
             logger.error(f"Groq streaming failed: {e}")
             yield f"Error: {str(e)}"
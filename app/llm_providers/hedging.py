@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncGenerator, Deque, Dict
+
+from .base import BaseLLM
+from ..config.settings import settings
+from ..utils.metrics import LLM_HEDGES
+
+logger = logging.getLogger(__name__)
+
+# Sync hedged calls run both attempts here so the caller can wait on either.
+# Every sync hedged call holds a worker for its primary, plus one per hedge
+# until the loser finishes, so llm_hedge_max_workers has to cover the
+# concurrent sync hedged calls twice over.
+_hedge_pool = ThreadPoolExecutor(max_workers=settings.llm_hedge_max_workers, thread_name_prefix="llm-hedge")
+
+
+def _succeeded(result: Dict[str, Any]) -> bool:
+    return result.get("status") == "success"
+
+
+def _raised(name: str, e: BaseException) -> Dict[str, Any]:
+    return {"status": "error", "content": f"{name} raised", "error": str(e)}
+
+
+class HedgedLLM(BaseLLM):
+    """
+    Tail-latency hedging: if the primary has not answered within the hedge
+    delay, the same prompt also goes to the hedge provider/model and the
+    first success wins. The delay is the llm_hedge_percentile of recent
+    primary latencies, clamped to the configured bounds, so only the slow
+    tail is duplicated. A primary that fails early triggers the hedge at
+    once.
+
+    Async losers are cancelled; sync losers cannot be interrupted and are
+    left to finish in the background with their result discarded. A sync
+    primary's hedge delay runs from when it leaves the pool queue, so a
+    saturated pool delays calls rather than hedging them.
+    Streaming is not hedged.
+    """
+
+    def __init__(self, primary: BaseLLM, hedge: BaseLLM):
+        self.primary = primary
+        self.hedge = hedge
+        self.provider = getattr(primary, "provider", "")
+        self.model = getattr(primary, "model", "")
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=settings.llm_hedge_window_size)
+
+    # -----------------------------
+    # Hedge delay
+    # -----------------------------
+
+    def _observe(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < settings.llm_hedge_min_samples:
+            delay = settings.llm_hedge_initial_delay_seconds
+        else:
+            rank = max(1, math.ceil(settings.llm_hedge_percentile / 100 * len(samples)))
+            delay = samples[min(rank, len(samples)) - 1]
+        return min(max(delay, settings.llm_hedge_min_delay_seconds), settings.llm_hedge_max_delay_seconds)
+
+    def _finish(self, outcome: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        LLM_HEDGES.labels(outcome).inc()
+        if outcome == "hedge_won":
+            result = dict(result)
+            result["hedged"] = True
+        return result
+
+    # -----------------------------
+    # Calls
+    # -----------------------------
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        started = threading.Event()
+
+        def run_primary():
+            started.set()
+            return self.primary.generate(prompt, **kwargs)
+
+        primary = _hedge_pool.submit(contextvars.copy_context().run, run_primary)
+        started.wait()
+        start = time.perf_counter()
+        done, _ = wait([primary], timeout=self.hedge_delay())
+        primary_result = self._future_result("primary", primary) if done else None
+        if primary_result is not None and _succeeded(primary_result):
+            self._observe(time.perf_counter() - start)
+            return self._finish("not_fired", primary_result)
+
+        logger.info("Hedging LLM call" + (" after primary failure" if done else ""))
+        hedge = _hedge_pool.submit(contextvars.copy_context().run, self.hedge.generate, prompt, **kwargs)
+        pending = {hedge} if done else {primary, hedge}
+        hedge_result = None
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future is primary:
+                    primary_result = self._future_result("primary", future)
+                    if _succeeded(primary_result):
+                        self._observe(time.perf_counter() - start)
+                        return self._finish("primary_won", primary_result)
+                else:
+                    hedge_result = self._future_result("hedge", future)
+                    if _succeeded(hedge_result):
+                        if primary in pending:
+                            # Censored sample: the primary took at least this long
+                            self._observe(time.perf_counter() - start)
+                        return self._finish("hedge_won", hedge_result)
+        return self._finish("both_failed", primary_result or hedge_result)
+
+    @staticmethod
+    def _future_result(name: str, future: Future) -> Dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            return _raised(name, e)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        start = time.perf_counter()
+        primary = asyncio.create_task(self.primary.agenerate(prompt, **kwargs))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+            primary_result = self._task_result("primary", primary) if done else None
+            if primary_result is not None and _succeeded(primary_result):
+                self._observe(time.perf_counter() - start)
+                return self._finish("not_fired", primary_result)
+
+            logger.info("Hedging LLM call" + (" after primary failure" if done else ""))
+            hedge = asyncio.create_task(self.hedge.agenerate(prompt, **kwargs))
+            pending = {hedge} if done else {primary, hedge}
+            hedge_result = None
+            while pending:
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    if task is primary:
+                        primary_result = self._task_result("primary", task)
+                        if _succeeded(primary_result):
+                            self._observe(time.perf_counter() - start)
+                            return self._finish("primary_won", primary_result)
+                    else:
+                        hedge_result = self._task_result("hedge", task)
+                        if _succeeded(hedge_result):
+                            if primary in pending:
+                                self._observe(time.perf_counter() - start)
+                            return self._finish("hedge_won", hedge_result)
+            return self._finish("both_failed", primary_result or hedge_result)
+        finally:
+            # The loser, or both when the caller itself was cancelled
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _task_result(name: str, task: asyncio.Task) -> Dict[str, Any]:
+        try:
+            return task.result()
+        except Exception as e:
+            return _raised(name, e)
+
+    def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        return self.primary.stream_generate(prompt, **kwargs)
+
+    def health_check(self):
+        return {"primary": self.primary.health_check(), "hedge": self.hedge.health_check()}
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Tuple
+
+import httpx
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientPool:
+    """
+    Process-wide pool of keep-alive httpx clients, keyed by base_url.
+    Sync clients are shared across threads; async clients are bound to an
+    event loop, so they are keyed by (base_url, loop) and entries for loops
+    that have since closed are dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[Tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.http_pool_max_connections,
+            max_keepalive_connections=settings.http_pool_max_keepalive,
+            keepalive_expiry=settings.http_pool_keepalive_expiry,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            float(settings.ollama_timeout),
+            connect=settings.http_pool_connect_timeout,
+        )
+
+    def get_client(self, base_url: str) -> httpx.Client:
+        """Return the shared sync client for base_url, creating it on first use."""
+        key = base_url.rstrip("/")
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.is_closed:
+                logger.info(f"Opening pooled HTTP client for {key}")
+                client = httpx.Client(
+                    base_url=key,
+                    limits=self._limits(),
+                    timeout=self._timeout(),
+                )
+                self._clients[key] = client
+            return client
+
+    def get_async_client(self, base_url: str) -> httpx.AsyncClient:
+        """Return the shared async client for base_url on the running event loop."""
+        url = base_url.rstrip("/")
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Their transports died with the loop; nothing left to close
+            for stale in [k for k in self._async_clients if k[1].is_closed()]:
+                del self._async_clients[stale]
+            client = self._async_clients.get((url, loop))
+            if client is None or client.is_closed:
+                logger.info(f"Opening pooled async HTTP client for {url}")
+                client = httpx.AsyncClient(
+                    base_url=url,
+                    limits=self._limits(),
+                    timeout=self._timeout(),
+                )
+                self._async_clients[(url, loop)] = client
+            return client
+
+    def close(self):
+        """Close all sync clients."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client: {e}")
+
+    async def aclose(self):
+        """Close every pooled client. Called from the application lifespan.
+        Clients of other running loops are closed on their own loop."""
+        current = asyncio.get_running_loop()
+        with self._lock:
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        for (_, loop), client in async_clients:
+            try:
+                if loop is current:
+                    await client.aclose()
+                elif not loop.is_closed():
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            except Exception as e:
+                logger.warning(f"Failed to close async HTTP client: {e}")
+        self.close()
+
+
+# Singleton instance shared by all providers
+http_pool = HTTPClientPool()
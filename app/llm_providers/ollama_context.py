@@ -0,0 +1,103 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config.settings import settings
+from ..utils.metrics import record_cache_lookup
+
+
+def history_digest(messages: Iterable[Dict[str, Any]], start: str = "") -> str:
+    """
+    Chained digest of a conversation's (role, content) messages. Extending a
+    digest with new messages gives the same value as digesting the whole
+    list, so the provider can advance it without the stored history.
+    """
+    digest = start
+    for message in messages:
+        raw = f"{digest}\x00{message.get('role', '')}\x00{message.get('content', '')}"
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return digest
+
+
+class ConversationContextStore:
+    """
+    Ollama context arrays per conversation, so the next turn can send only
+    its new text and skip re-processing the shared history.
+
+    An entry is only handed out for the same model and the same history
+    digest it was stored under; anything else (another model, an edited or
+    summarised history, a turn served by a different provider) falls back
+    to the full prompt. LRU-bounded by ollama_context_max_conversations and
+    dropped after ollama_context_ttl_seconds without use.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or settings.ollama_context_max_conversations
+        self.ttl = ttl_seconds or settings.ollama_context_ttl_seconds
+        self._lock = threading.Lock()
+        # conversation id -> (expires_at, model, history digest, context tokens)
+        self._entries: "OrderedDict[str, Tuple[float, str, str, List[int]]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "oversized": 0}
+
+    def get(self, conversation_id: str, model: str, history: str) -> Optional[List[int]]:
+        """Context for the conversation if it still matches model and history."""
+        tokens = self._get(conversation_id, model, history)
+        record_cache_lookup("ollama_context", tokens is not None)
+        return tokens
+
+    def _get(self, conversation_id: str, model: str, history: str) -> Optional[List[int]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, entry_model, entry_history, tokens = entry
+            if expires_at <= now or entry_model != model or entry_history != history:
+                # Stale for good: the conversation has moved on without us
+                del self._entries[conversation_id]
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(conversation_id)
+            self._stats["hits"] += 1
+            return tokens
+
+    def covers(self, conversation_id: str, history: str) -> bool:
+        """Whether a live context is stored for this exact history (any model).
+        A peek: no stats, nothing dropped."""
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+        return entry is not None and entry[0] > time.time() and entry[2] == history
+
+    def put(self, conversation_id: str, model: str, history: str, tokens: List[int]):
+        with self._lock:
+            if len(tokens) > settings.ollama_context_max_tokens:
+                # Near the model's window; start the next turn from the (trimmed) full prompt
+                self._entries.pop(conversation_id, None)
+                self._stats["oversized"] += 1
+                return
+            self._entries[conversation_id] = (time.time() + self.ttl, model, history, list(tokens))
+            self._entries.move_to_end(conversation_id)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, conversation_id: Optional[str] = None) -> int:
+        """Drop one conversation's context, or all of them."""
+        with self._lock:
+            if conversation_id is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            return 1 if self._entries.pop(conversation_id, None) is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+
+# Singleton instance shared by all Ollama providers
+conversation_contexts = ConversationContextStore()
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from .http_pool import http_pool
+from ..config.settings import settings
+from ..utils.metrics import OLLAMA_MODEL_LOAD_DURATION, OLLAMA_MODEL_LOADED
+
+logger = logging.getLogger(__name__)
+
+DISABLED, UNKNOWN, LOADING, LOADED, NOT_LOADED, UNREACHABLE = (
+    "disabled", "unknown", "loading", "loaded", "not_loaded", "unreachable"
+)
+
+
+def _parse_expiry(value: str) -> Optional[float]:
+    """Seconds from now until an Ollama expires_at timestamp (nanosecond precision)."""
+    if not value:
+        return None
+    # Older fromisoformat() takes at most microseconds
+    value = re.sub(r"(\.\d{6})\d+", r"\1", value.replace("Z", "+00:00"))
+    try:
+        expires = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return (expires - datetime.now(timezone.utc)).total_seconds()
+
+
+class OllamaKeepAlive:
+    """
+    Keeps the configured Ollama model resident so the first request after
+    a quiet period does not pay the model load time.
+
+    start() preloads the model in the background (an empty generate request
+    carrying keep_alive), then checks Ollama's /api/ps every
+    ollama_keepalive_interval_seconds and preloads again when the model has
+    been unloaded or would expire before the next check. Regular traffic
+    renews the expiry itself, so a busy server sends no extra requests.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None):
+        self.base_url = (base_url or settings.ollama_base_url).rstrip("/")
+        self.model = model or settings.ollama_model_name
+        self._task: Optional[asyncio.Task] = None
+        # Preload started by a readiness probe, outside the keep-alive schedule
+        self._kick: Optional[asyncio.Task] = None
+        self._loading = False
+        self._state = UNKNOWN
+        self._expires_in: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._last_load_seconds: Optional[float] = None
+        self._error: Optional[str] = None
+        self._stats = {"preloads": 0, "failures": 0}
+
+    @staticmethod
+    def in_use() -> bool:
+        """Whether Ollama should be kept warm: as the primary provider, or as a
+        fallback when ollama_warmup_fallback opts in."""
+        if settings.llm_provider == "ollama":
+            return True
+        if not settings.ollama_warmup_fallback:
+            return False
+        if settings.llm_routing_enabled and "ollama" in settings.llm_routing_providers:
+            return True
+        return settings.llm_hedging_enabled and settings.llm_hedge_provider == "ollama"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ollama_warmup_enabled and settings.ollama_keep_alive_seconds != 0 and self.in_use()
+
+    def _set_state(self, state: str, error: Optional[str] = None):
+        if state != self._state:
+            logger.info(f"Ollama model {self.model}: {self._state} -> {state}")
+        self._state = state
+        self._error = error
+        self._checked_at = time.time()
+        OLLAMA_MODEL_LOADED.labels(self.model).set(1 if state == LOADED else 0)
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def start(self):
+        """Schedule warm-up and keep-alive on the running loop. Called from the lifespan."""
+        if not self.enabled:
+            self._state = DISABLED
+            return
+        if self._task is not None and not self._task.done():
+            return
+        interval = settings.ollama_keepalive_interval_seconds
+        if 0 < settings.ollama_keep_alive_seconds < interval:
+            logger.warning(
+                f"ollama_keep_alive_seconds ({settings.ollama_keep_alive_seconds}) is shorter than "
+                f"ollama_keepalive_interval_seconds ({interval}); the model may unload between checks"
+            )
+        self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self):
+        tasks = [t for t in (self._task, self._kick) if t is not None]
+        self._task = self._kick = None
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        await self.preload()
+        interval = settings.ollama_keepalive_interval_seconds
+        if interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Ollama keep-alive check failed: {e}")
+
+    # -----------------------------
+    # Ollama calls
+    # -----------------------------
+
+    async def preload(self) -> bool:
+        """Load the model (or renew its residency). True once Ollama reports it loaded."""
+        self._loading = True
+        if self._state != LOADED:
+            # A renewal keeps the model serving; only a real load makes it unready
+            self._set_state(LOADING)
+        self._stats["preloads"] += 1
+        try:
+            client = http_pool.get_async_client(self.base_url)
+            response = await client.post(
+                f"{self.base_url}/api/generate",
+                json={"model": self.model, "keep_alive": settings.ollama_keep_alive_seconds},
+                timeout=float(settings.ollama_timeout)
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            self._stats["failures"] += 1
+            logger.warning(f"Ollama warm-up of {self.model} failed: {e}")
+            self._set_state(UNREACHABLE, str(e) or type(e).__name__)
+            return False
+        finally:
+            self._loading = False
+
+        # Ollama reports durations in nanoseconds; near zero when already resident
+        self._last_load_seconds = data.get("load_duration", 0) / 1e9
+        OLLAMA_MODEL_LOAD_DURATION.labels(self.model).observe(self._last_load_seconds)
+        self._expires_in = float(settings.ollama_keep_alive_seconds)
+        self._set_state(LOADED)
+        return True
+
+    async def check(self) -> Optional[float]:
+        """Ask /api/ps whether the model is resident; seconds until it expires, or None."""
+        try:
+            client = http_pool.get_async_client(self.base_url)
+            response = await client.get(f"{self.base_url}/api/ps", timeout=settings.http_pool_connect_timeout)
+            response.raise_for_status()
+            models = response.json().get("models") or []
+        except Exception as e:
+            if not self._loading:
+                self._set_state(UNREACHABLE, str(e) or type(e).__name__)
+            raise
+
+        names = {self.model, f"{self.model}:latest"}
+        entry = next((m for m in models if m.get("name") in names or m.get("model") in names), None)
+        if self._loading:
+            # A preload is in flight; /api/ps lags behind it
+            return None if entry is None else _parse_expiry(entry.get("expires_at", ""))
+        if entry is None:
+            self._expires_in = None
+            self._set_state(NOT_LOADED)
+            return None
+        self._expires_in = _parse_expiry(entry.get("expires_at", ""))
+        self._set_state(LOADED)
+        return self._expires_in
+
+    async def refresh(self):
+        """One keep-alive tick: preload when unloaded or about to expire."""
+        if self._loading:
+            return
+        try:
+            expires_in = await self.check()
+        except Exception:
+            # Still try to load: Ollama may have come up since the last tick
+            await self.preload()
+            return
+        interval = settings.ollama_keepalive_interval_seconds
+        # Half an interval of slack for a late tick
+        if expires_in is None or expires_in < interval * 1.5:
+            await self.preload()
+
+    # -----------------------------
+    # Readiness
+    # -----------------------------
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "base_url": self.base_url,
+            "state": self._state,
+            "expires_in_s": round(self._expires_in, 1) if self._expires_in is not None else None,
+            "last_load_s": round(self._last_load_seconds, 3) if self._last_load_seconds is not None else None,
+            "checked_at": self._checked_at,
+            "error": self._error,
+            **self._stats
+        }
+
+    async def readiness(self) -> Dict[str, Any]:
+        """Fresh model state for a readiness probe. ready is False only while Ollama is the
+        primary provider and its model is not resident."""
+        if self._state != DISABLED and not self._loading:
+            try:
+                await self.check()
+            except Exception:
+                pass
+        required = settings.llm_provider == "ollama" and self._state != DISABLED
+        if required and self._state in (NOT_LOADED, UNREACHABLE) and self.enabled and \
+                (self._kick is None or self._kick.done()):
+            # Don't wait for the next keep-alive tick once Ollama is back;
+            # the probe answers now and the load runs in the background
+            self._kick = asyncio.create_task(self.preload())
+        return {"ready": not required or self._state == LOADED, "ollama": self.status()}
+
+
+# Singleton instance started by the application lifespan
+ollama_keepalive = OllamaKeepAlive()
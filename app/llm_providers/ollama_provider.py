@@ -1,9 +1,13 @@
+import asyncio
 import logging
 import httpx
 import time
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 from .base import BaseLLM
+from .http_pool import http_pool
+from .ollama_context import conversation_contexts, history_digest
 from ..config.settings import settings
+from ..utils.deadline import remaining_time
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +28,11 @@ class OllamaLLM(BaseLLM):
                 return func(*args, **kwargs)
             except (httpx.ConnectError, httpx.TimeoutException) as e:
                 last_exception = e
-                if attempt < self.max_retries:
+                if attempt < self.max_retries and self._can_retry():
                     logger.warning(f"Ollama request failed (attempt {attempt + 1}), retrying... Error: {e}")
                     time.sleep(1)
+                else:
+                    break
                 continue
             except httpx.HTTPStatusError as e:
                 logger.error(f"Ollama HTTP error {e.response.status_code}: {e.response.text}")
@@ -37,71 +43,166 @@ class OllamaLLM(BaseLLM):
         
         raise last_exception or Exception("Ollama request failed after retries")
 
-    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
-        """Generate response with hardening."""
-        def make_request():
-            with httpx.Client(timeout=self.timeout) as client:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": kwargs.get("temperature", 0.7)
-                    }
-                }
-                response = client.post(f"{self.base_url}/api/generate", json=payload)
-                response.raise_for_status()
-                return response.json()
+    async def _aexecute_with_retry(self, func, *args, **kwargs):
+        """Async counterpart of _execute_with_retry."""
+        last_exception = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await func(*args, **kwargs)
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                last_exception = e
+                if attempt < self.max_retries and self._can_retry():
+                    logger.warning(f"Ollama request failed (attempt {attempt + 1}), retrying... Error: {e}")
+                    await asyncio.sleep(1)
+                else:
+                    break
+                continue
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Ollama HTTP error {e.response.status_code}: {e.response.text}")
+                raise
+            except Exception as e:
+                logger.error(f"Unexpected Ollama error: {e}")
+                raise
 
-        try:
-            data = self._execute_with_retry(make_request)
-            return {
-                "status": "success",
-                "content": data.get("response", ""),
-                "model": f"ollama/{self.model}",
-                "provider": "ollama"
-            }
-        except Exception as e:
-            error_msg = f"Ollama generation failed: {str(e)}"
-            logger.error(error_msg)
-            return {
-                "status": "error",
-                "content": "Provider error: Ollama is unavailable or misconfigured.",
-                "error": error_msg,
-                "provider": "ollama"
-            }
+        raise last_exception or Exception("Ollama request failed after retries")
 
-    async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
-        """Stream response with timeout handling."""
+    def _can_retry(self) -> bool:
+        # A retry is only worth it if the request deadline leaves room for one
+        remaining = remaining_time()
+        return remaining is None or remaining > 1.0
+
+    def _request_timeout(self):
+        """Per-request timeout bounded by the active deadline, else the client default."""
+        remaining = remaining_time()
+        if remaining is None:
+            return httpx.USE_CLIENT_DEFAULT
+        return httpx.Timeout(max(remaining, 0.1), connect=settings.http_pool_connect_timeout)
+
+    def _conversation_context(self, prompt: str, kwargs: Dict[str, Any]) -> Tuple[str, Optional[List[int]]]:
+        """
+        The prompt to send and the stored context to send with it. A caller's
+        conversation={"id", "history", "message", "turn"} names the history
+        digest the prompt is built from, the new user message, and the
+        suffix of the prompt holding this turn; with a matching stored
+        context only that suffix goes to Ollama.
+        """
+        conversation = kwargs.get("conversation")
+        if not conversation or not settings.ollama_context_reuse_enabled:
+            return prompt, None
+        turn = conversation.get("turn") or ""
+        if not turn or not prompt.endswith(turn):
+            return prompt, None
+        tokens = conversation_contexts.get(conversation["id"], self.model, conversation["history"])
+        if tokens is None:
+            return prompt, None
+        return turn, tokens
+
+    def _remember_context(self, kwargs: Dict[str, Any], response: str, tokens: Optional[List[int]]):
+        """Store the context covering this turn, keyed by the history it leaves behind."""
+        conversation = kwargs.get("conversation")
+        if not conversation or not tokens or not settings.ollama_context_reuse_enabled:
+            return
+        history = history_digest(
+            [{"role": "user", "content": conversation.get("message", "")},
+             {"role": "assistant", "content": response}],
+            start=conversation["history"]
+        )
+        conversation_contexts.put(conversation["id"], self.model, history, tokens)
+
+    def _build_payload(self, prompt: str, stream: bool, **kwargs) -> Dict[str, Any]:
+        prompt, context = self._conversation_context(prompt, kwargs)
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": True,
+            "stream": stream,
+            "keep_alive": settings.ollama_keep_alive_seconds,
             "options": {
                 "temperature": kwargs.get("temperature", 0.7)
             }
         }
+        if context is not None:
+            payload["context"] = context
+        return payload
+
+    def _success(self, data: Dict[str, Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        self._remember_context(kwargs, data.get("response", ""), data.get("context"))
+        return {
+            "status": "success",
+            "content": data.get("response", ""),
+            "model": f"ollama/{self.model}",
+            "provider": "ollama"
+        }
+
+    def _failure(self, e: Exception) -> Dict[str, Any]:
+        error_msg = f"Ollama generation failed: {str(e)}"
+        logger.error(error_msg)
+        return {
+            "status": "error",
+            "content": "Provider error: Ollama is unavailable or misconfigured.",
+            "error": error_msg,
+            "provider": "ollama"
+        }
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Generate response with hardening."""
+        def make_request():
+            client = http_pool.get_client(self.base_url)
+            payload = self._build_payload(prompt, stream=False, **kwargs)
+            response = client.post(f"{self.base_url}/api/generate", json=payload, timeout=self._request_timeout())
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            return self._success(self._execute_with_retry(make_request), kwargs)
+        except Exception as e:
+            return self._failure(e)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Native async generation over the pooled AsyncClient."""
+        async def make_request():
+            client = http_pool.get_async_client(self.base_url)
+            payload = self._build_payload(prompt, stream=False, **kwargs)
+            response = await client.post(
+                f"{self.base_url}/api/generate", json=payload, timeout=self._request_timeout()
+            )
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            return self._success(await self._aexecute_with_retry(make_request), kwargs)
+        except Exception as e:
+            return self._failure(e)
+
+    async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        """Stream response with timeout handling."""
+        payload = self._build_payload(prompt, stream=True, **kwargs)
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream("POST", f"{self.base_url}/api/generate", json=payload) as response:
-                    if response.status_code != 200:
-                        error_text = await response.aread()
-                        logger.error(f"Ollama streaming error {response.status_code}: {error_text.decode()}")
-                        yield f"Error: Ollama returned status {response.status_code}"
-                        return
-
-                    async for line in response.aiter_lines():
-                        if line:
-                            import json
-                            try:
-                                data = json.loads(line)
-                                if "response" in data:
-                                    yield data["response"]
-                                if data.get("done"):
-                                    break
-                            except json.JSONDecodeError:
-                                continue
+            client = http_pool.get_async_client(self.base_url)
+            async with client.stream(
+                "POST", f"{self.base_url}/api/generate", json=payload, timeout=self._request_timeout()
+            ) as response:
+                if response.status_code != 200:
+                    error_text = await response.aread()
+                    logger.error(f"Ollama streaming error {response.status_code}: {error_text.decode()}")
+                    yield f"Error: Ollama returned status {response.status_code}"
+                    return
+
+                chunks = []
+                async for line in response.aiter_lines():
+                    if line:
+                        import json
+                        try:
+                            data = json.loads(line)
+                            if "response" in data:
+                                chunks.append(data["response"])
+                                yield data["response"]
+                            if data.get("done"):
+                                # The final line carries the context for the next turn
+                                self._remember_context(kwargs, "".join(chunks), data.get("context"))
+                                break
+                        except json.JSONDecodeError:
+                            continue
         except Exception as e:
             logger.error(f"Ollama streaming failed: {e}")
             yield f"Error: Connection to Ollama failed"
@@ -112,34 +213,34 @@ class OllamaLLM(BaseLLM):
         Pings /api/tags and checks if model exists.
         """
         try:
-            with httpx.Client(timeout=5.0) as client:
-                response = client.get(f"{self.base_url}/api/tags")
-                if response.status_code != 200:
-                    return {"provider": "ollama", "status": "unavailable", "reason": f"HTTP {response.status_code}"}
-                
-                data = response.json()
-                models = [m.get("name") for m in data.get("models", [])]
-                
-                # Check if configured model exists
-                status = "healthy"
-                if self.model not in models:
-                    logger.warning(f"Configured Ollama model '{self.model}' not found in available models: {models}")
-                    # Per requirement: "If model not pulled -> return controlled configuration error"
-                    # But here we return "healthy" status with models list if service is up, 
-                    # specific model check can be handled by the caller or reported in status.
-                    # We'll mark as unavailable if the model is missing to satisfy the "controlled configuration error"
-                    return {
-                        "provider": "ollama",
-                        "status": "unavailable",
-                        "reason": f"Model '{self.model}' not found. Please run 'ollama pull {self.model}'",
-                        "models": models
-                    }
-
+            client = http_pool.get_client(self.base_url)
+            response = client.get(f"{self.base_url}/api/tags", timeout=5.0)
+            if response.status_code != 200:
+                return {"provider": "ollama", "status": "unavailable", "reason": f"HTTP {response.status_code}"}
+            
+            data = response.json()
+            models = [m.get("name") for m in data.get("models", [])]
+            
+            # Check if configured model exists
+            status = "healthy"
+            if self.model not in models:
+                logger.warning(f"Configured Ollama model '{self.model}' not found in available models: {models}")
+                # Per requirement: "If model not pulled -> return controlled configuration error"
+                # But here we return "healthy" status with models list if service is up, 
+                # specific model check can be handled by the caller or reported in status.
+                # We'll mark as unavailable if the model is missing to satisfy the "controlled configuration error"
                 return {
                     "provider": "ollama",
-                    "status": "healthy",
+                    "status": "unavailable",
+                    "reason": f"Model '{self.model}' not found. Please run 'ollama pull {self.model}'",
                     "models": models
                 }
+
+            return {
+                "provider": "ollama",
+                "status": "healthy",
+                "models": models
+            }
         except (httpx.ConnectError, httpx.TimeoutException) as e:
             logger.error(f"Ollama health check failed: {e}")
             return {"provider": "ollama", "status": "unavailable", "reason": "Connection failed"}
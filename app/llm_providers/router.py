@@ -0,0 +1,157 @@
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from .base import BaseLLM
+from .circuit_breaker import CircuitBreaker, get_breaker
+from ..utils.rate_limiter import REJECTED_CHUNK_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+def _is_error_chunk(chunk: str) -> bool:
+    # Providers report stream failures in-band as the first chunk
+    return chunk.startswith("Error:") or chunk.endswith("provider not configured")
+
+
+class RoutedLLM(BaseLLM):
+    """
+    Health-aware routing over several providers. Each call goes to the
+    preferred provider, then to the others from healthiest to least
+    healthy, skipping any whose circuit breaker is open. Error results
+    and exceptions count against the provider and move on to the next;
+    calls refused by our own rate limiter ("rejected") move on without
+    counting. When every breaker is open the call fails at once.
+    """
+
+    def __init__(self, candidates: List[Tuple[str, BaseLLM]], preferred: str):
+        self.candidates = dict(candidates)
+        self.preferred = preferred
+        self.provider = "router"
+        self.model = getattr(self.candidates[preferred], "model", "")
+
+    def _order(self) -> List[Tuple[str, BaseLLM, CircuitBreaker]]:
+        others = sorted(
+            (name for name in self.candidates if name != self.preferred),
+            key=lambda name: get_breaker(name).health()
+        )
+        return [(name, self.candidates[name], get_breaker(name)) for name in [self.preferred] + others]
+
+    @staticmethod
+    def _unavailable(errors: List[str]) -> Dict[str, Any]:
+        return {
+            "status": "error",
+            "content": "No healthy LLM provider available",
+            "error": "; ".join(errors) or "All circuit breakers open"
+        }
+
+    def _note(self, name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        result = dict(result)
+        result.setdefault("provider", name)
+        if name != self.preferred:
+            result["failover_from"] = self.preferred
+        return result
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        errors = []
+        for name, llm, breaker in self._order():
+            if not breaker.allow():
+                continue
+            start = time.perf_counter()
+            try:
+                result = llm.generate(prompt, **kwargs)
+            except Exception as e:
+                result = {"status": "error", "content": f"{name} raised", "error": str(e)}
+            except BaseException:
+                breaker.release()
+                raise
+            ok = result.get("status") == "success"
+            if result.get("rejected"):
+                # Never reached the provider; local queueing says nothing about its health
+                breaker.release()
+            else:
+                breaker.record(ok, time.perf_counter() - start)
+            if ok:
+                return self._note(name, result)
+            errors.append(f"{name}: {result.get('error') or result.get('content')}")
+            logger.warning(f"Provider {name} failed, trying next | {errors[-1]}")
+        return self._unavailable(errors)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        errors = []
+        for name, llm, breaker in self._order():
+            if not breaker.allow():
+                continue
+            start = time.perf_counter()
+            try:
+                result = await llm.agenerate(prompt, **kwargs)
+            except Exception as e:
+                result = {"status": "error", "content": f"{name} raised", "error": str(e)}
+            except BaseException:
+                # Cancelled: says nothing about the provider's health
+                breaker.release()
+                raise
+            ok = result.get("status") == "success"
+            if result.get("rejected"):
+                # Never reached the provider; local queueing says nothing about its health
+                breaker.release()
+            else:
+                breaker.record(ok, time.perf_counter() - start)
+            if ok:
+                return self._note(name, result)
+            errors.append(f"{name}: {result.get('error') or result.get('content')}")
+            logger.warning(f"Provider {name} failed, trying next | {errors[-1]}")
+        return self._unavailable(errors)
+
+    async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        # Failover is only possible until the first chunk has been sent
+        last_error = "Error: No healthy LLM provider available"
+        for name, llm, breaker in self._order():
+            if not breaker.allow():
+                continue
+            start = time.perf_counter()
+            stream = llm.stream_generate(prompt, **kwargs)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                breaker.record(True, time.perf_counter() - start)
+                return
+            except Exception as e:
+                breaker.record(False, time.perf_counter() - start)
+                last_error = f"Error: {e}"
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            # Judged on time to first chunk; long answers are not slow calls
+            first_chunk_latency = time.perf_counter() - start
+
+            if first.startswith(REJECTED_CHUNK_PREFIX):
+                breaker.release()
+                last_error = first
+                logger.warning(f"Provider {name} stream not admitted, trying next | {first}")
+                continue
+            if _is_error_chunk(first):
+                breaker.record(False, time.perf_counter() - start)
+                last_error = first
+                logger.warning(f"Provider {name} stream failed, trying next | {first}")
+                continue
+
+            ok = True
+            try:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+            except Exception:
+                ok = False
+                raise
+            finally:
+                breaker.record(ok, first_chunk_latency)
+            return
+        yield last_error
+
+    def health_check(self) -> Dict[str, Any]:
+        return {
+            name: {"circuit": get_breaker(name).snapshot(), "check": llm.health_check()}
+            for name, llm in self.candidates.items()
+        }
@@ -0,0 +1,47 @@
+from typing import Any, AsyncGenerator, Dict
+
+from .wrapper import LLMWrapper
+from ..utils.tracing import span
+
+
+class TracedLLM(LLMWrapper):
+    """
+    Records an "llm" span per call on the request trace: provider, model,
+    prompt/response sizes, status and whether the answer came from cache.
+    """
+
+    def _attrs(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "model": getattr(self.inner, "model", ""),
+            "prompt_chars": len(prompt)
+        }
+
+    def _record(self, active, result: Dict[str, Any]):
+        # The model stays as set in _attrs: results carry a provider-prefixed
+        # name only on success, which would split one model across two labels
+        active.set(
+            status=result.get("status"),
+            response_chars=len(result.get("content") or ""),
+            cached=bool(result.get("cached"))
+        )
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        with span("llm", **self._attrs(prompt)) as active:
+            result = self.inner.generate(prompt, **kwargs)
+            self._record(active, result)
+            return result
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        with span("llm", **self._attrs(prompt)) as active:
+            result = await self.inner.agenerate(prompt, **kwargs)
+            self._record(active, result)
+            return result
+
+    async def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        with span("llm.stream", **self._attrs(prompt)) as active:
+            size = 0
+            async for chunk in self.inner.stream_generate(prompt, **kwargs):
+                size += len(chunk)
+                yield chunk
+            active.set(response_chars=size)
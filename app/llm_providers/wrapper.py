@@ -0,0 +1,32 @@
+from typing import Any, AsyncGenerator, Dict
+
+from .base import BaseLLM
+
+
+class LLMWrapper(BaseLLM):
+    """
+    Base class for decorators around a provider (caching, coalescing, ...).
+    Everything not overridden is delegated to the wrapped provider.
+    """
+
+    def __init__(self, inner: BaseLLM, provider: str):
+        self.inner = inner
+        self.provider = provider
+
+    def __getattr__(self, name):
+        # Expose provider attributes such as model/base_url transparently
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return self.inner.generate(prompt, **kwargs)
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        return await self.inner.agenerate(prompt, **kwargs)
+
+    def stream_generate(self, prompt: str, **kwargs) -> AsyncGenerator[str, None]:
+        return self.inner.stream_generate(prompt, **kwargs)
+
+    def health_check(self):
+        return self.inner.health_check()
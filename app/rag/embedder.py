@@ -1,5 +1,6 @@
 from sentence_transformers import SentenceTransformer
 from ..config.settings import settings
+from ..utils.tracing import span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,10 @@ class Embedder:
 
     def embed_query(self, text: str) -> list[float]:
         """Embed a single query string."""
-        return self._model.encode(text).tolist()
+        with span("embedding", texts=1):
+            return self._model.encode(text).tolist()
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         """Embed a list of documents."""
-        return self._model.encode(texts).tolist()
+        with span("embedding", texts=len(texts)):
+            return self._model.encode(texts).tolist()
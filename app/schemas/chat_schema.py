@@ -5,4 +5,4 @@ class ChatRequest(BaseModel):
     question: str
     mode: str = "chat"          # chat | summary | research
     max_lines: Optional[int] = None
-    provider: Optional[Literal["groq", "ollama"]] = None
+    provider: Optional[Literal["groq", "ollama", "fake"]] = None
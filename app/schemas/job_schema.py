@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, Literal
+
+class JobRequest(BaseModel):
+    mode: Literal["research", "summary", "chat"]
+    question: str
+    provider: Optional[Literal["groq", "ollama", "fake"]] = None
+    max_lines: Optional[int] = None
+    # Overall time budget in seconds; defaults to jobs_deadline_seconds
+    deadline_seconds: Optional[float] = Field(default=None, gt=0)
+
+class JobStatus(BaseModel):
+    job_id: str
+    mode: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    error: Optional[str] = None
+
+class JobResult(JobStatus):
+    result: Optional[Dict[str, Any]] = None
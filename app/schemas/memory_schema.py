@@ -5,4 +5,4 @@ class MemoryChatRequest(BaseModel):
     user_id: str
     conversation_id: str
     question: str
-    provider: Optional[Literal["groq", "ollama"]] = None
+    provider: Optional[Literal["groq", "ollama", "fake"]] = None
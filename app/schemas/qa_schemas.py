@@ -5,7 +5,7 @@ class GenerateQuestionsRequest(BaseModel):
     keyword: str
     num_questions: int = Field(default=3, ge=3, le=5)
     difficulty: Literal["easy", "medium", "hard", "mixed"] = "mixed"
-    provider: Optional[Literal["groq", "ollama"]] = "groq"
+    provider: Optional[Literal["groq", "ollama", "fake"]] = "groq"
 
 class QuestionDetail(BaseModel):
     id: int
@@ -18,7 +18,7 @@ class GenerateQuestionsResponse(BaseModel):
 
 class AnswerQuestionsRequest(BaseModel):
     questions: List[str]
-    provider: Optional[Literal["groq", "ollama"]] = "groq"
+    provider: Optional[Literal["groq", "ollama", "fake"]] = "groq"
 
 class AnswerResult(BaseModel):
     question: str
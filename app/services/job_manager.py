@@ -0,0 +1,318 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "job_id", "mode", "params", "status", "result", "error",
+    "created_at", "started_at", "finished_at", "expires_at"
+)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class JobManager:
+    """
+    Runs orchestration-graph jobs (research, summary, chat) off the request
+    path on a bounded worker pool.
+
+    Jobs are persisted in SQLite, which several worker processes may share.
+    A running job records the worker that claimed it, and that worker
+    renews the job's heartbeat every jobs_heartbeat_interval_seconds. A
+    running job whose heartbeat is older than jobs_heartbeat_stale_seconds
+    belongs to a worker that stopped; it is re-queued (on start() and on
+    every heartbeat) and claimed again by whichever worker gets to it first.
+    Each heartbeat also dispatches jobs left queued for that long, so the
+    backlog of a stopped worker is picked up without a restart.
+    Finished jobs keep their result until jobs_result_ttl_seconds after
+    completion, then are purged.
+
+    A queued job can be cancelled outright. A running job cannot be
+    interrupted; it is marked cancelled and its result is discarded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._worker_id: Optional[str] = None
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def start(self):
+        """Open the job store, start workers and resume unfinished jobs."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            if self._db is None:
+                self._db = self._open_db(settings.jobs_db_path)
+            self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+            self._pool = ThreadPoolExecutor(max_workers=settings.jobs_max_workers, thread_name_prefix="job")
+            self._stop.clear()
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+            self._heartbeat.start()
+            self._requeue_stale()
+            # Other workers may dispatch these too; the claim in _execute runs each once
+            pending = [row[0] for row in self._db.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY created_at"
+            )]
+
+        self.purge_expired()
+        for job_id in pending:
+            self._dispatch(job_id)
+        if pending:
+            logger.info(f"Resumed {len(pending)} queued job(s)")
+
+    def shutdown(self):
+        """Stop accepting work. Queued jobs stay persisted for the next start()."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            futures, self._futures = self._futures, {}
+        if pool is None:
+            return
+        # Jobs still running here stop heartbeating and are reclaimed once stale
+        self._stop.set()
+        for future in futures.values():
+            future.cancel()
+        pool.shutdown(wait=False)
+
+    def _open_db(self, path: str) -> sqlite3.Connection:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, mode TEXT NOT NULL, params TEXT NOT NULL, "
+            "status TEXT NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, "
+            "started_at REAL, finished_at REAL, expires_at REAL, owner TEXT, heartbeat_at REAL)"
+        )
+        # Stores created before jobs carried an owner and heartbeat
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        conn.commit()
+        logger.info(f"Job store at {path}")
+        return conn
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+
+    def _ensure_started(self):
+        if self._pool is None:
+            self.start()
+
+    def submit(self, mode: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._ensure_started()
+        self.purge_expired()
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            queued = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            if queued >= settings.jobs_max_pending:
+                raise JobQueueFull(f"{queued} jobs pending; limit is {settings.jobs_max_pending}")
+            self._db.execute(
+                "INSERT INTO jobs (job_id, mode, params, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, mode, json.dumps(params), time.time())
+            )
+            self._db.commit()
+
+        self._dispatch(job_id)
+        logger.info(f"Job {job_id} queued | mode={mode}")
+        return self.get(job_id)
+
+    def get(self, job_id: str, include_result: bool = False) -> Optional[Dict[str, Any]]:
+        self._ensure_started()
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        job = dict(zip(_COLUMNS, row))
+        if job["expires_at"] is not None and job["expires_at"] <= time.time():
+            return None
+        job.pop("params")
+        result = job.pop("result")
+        if include_result:
+            job["result"] = json.loads(result) if result else None
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self._ensure_started()
+        now = time.time()
+        with self._lock:
+            updated = self._db.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, expires_at = ? "
+                "WHERE job_id = ? AND status IN ('queued', 'running')",
+                (now, now + settings.jobs_result_ttl_seconds, job_id)
+            ).rowcount
+            self._db.commit()
+            future = self._futures.pop(job_id, None)
+        if updated and future is not None:
+            future.cancel()
+            logger.info(f"Job {job_id} cancelled")
+        return self.get(job_id)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+            self._db.commit()
+        if removed:
+            logger.info(f"Purged {removed} expired job(s)")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        if self._db is None:
+            return {"running": False}
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {
+            "running": self._pool is not None,
+            "worker_id": self._worker_id,
+            "workers": settings.jobs_max_workers,
+            "jobs": counts
+        }
+
+    # -----------------------------
+    # Ownership
+    # -----------------------------
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(settings.jobs_heartbeat_interval_seconds):
+            try:
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+                        (time.time(), self._worker_id)
+                    )
+                    self._db.commit()
+                    requeued = self._requeue_stale()
+                    orphaned = self._orphaned_queued()
+                for job_id in dict.fromkeys(requeued + orphaned):
+                    self._dispatch(job_id)
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def _requeue_stale(self) -> list:
+        """Re-queue running jobs whose worker stopped heartbeating. Caller holds the lock."""
+        cutoff = time.time() - settings.jobs_heartbeat_stale_seconds
+        stale = [row[0] for row in self._db.execute(
+            "SELECT job_id FROM jobs WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+            (cutoff,)
+        )]
+        requeued = [job_id for job_id in stale if self._db.execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, heartbeat_at = NULL "
+            "WHERE job_id = ? AND status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+            (job_id, cutoff)
+        ).rowcount]
+        self._db.commit()
+        if requeued:
+            logger.warning(f"Re-queued {len(requeued)} job(s) from stopped workers")
+        return requeued
+
+    def _orphaned_queued(self) -> list:
+        """Jobs queued for longer than jobs_heartbeat_stale_seconds that this worker
+        has not dispatched, e.g. left behind by a worker that stopped. Caller holds
+        the lock."""
+        cutoff = time.time() - settings.jobs_heartbeat_stale_seconds
+        return [row[0] for row in self._db.execute(
+            "SELECT job_id FROM jobs WHERE status = 'queued' AND created_at < ? ORDER BY created_at",
+            (cutoff,)
+        ) if row[0] not in self._futures]
+
+    # -----------------------------
+    # Execution
+    # -----------------------------
+
+    def _dispatch(self, job_id: str):
+        with self._lock:
+            if self._pool is None:
+                return
+            future = self._pool.submit(self._execute, job_id)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._forget(job_id, f))
+
+    def _forget(self, job_id: str, future: Future):
+        with self._lock:
+            if self._futures.get(job_id) is future:
+                del self._futures[job_id]
+
+    def _transition(self, job_id: str, sql: str, args: tuple) -> bool:
+        """Apply a status change only while the job is still active."""
+        with self._lock:
+            updated = self._db.execute(sql, args + (job_id,)).rowcount
+            self._db.commit()
+        return bool(updated)
+
+    def _execute(self, job_id: str):
+        # Imported here: the graph pulls in every agent and provider
+        from ..graphs.orchestration_graph import run_graph
+
+        now = time.time()
+        # Atomic claim: of the workers that dispatched this job, one runs it
+        if not self._transition(
+            job_id,
+            "UPDATE jobs SET status = 'running', started_at = ?, owner = ?, heartbeat_at = ? "
+            "WHERE job_id = ? AND status = 'queued'",
+            (now, self._worker_id, now)
+        ):
+            return
+
+        with self._lock:
+            mode, params = self._db.execute(
+                "SELECT mode, params FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        params = json.loads(params)
+
+        try:
+            result = run_graph(
+                question=params["question"],
+                mode=mode,
+                max_lines=params.get("max_lines"),
+                provider=params.get("provider"),
+                deadline=params.get("deadline_seconds") or settings.jobs_deadline_seconds
+            )
+            status, payload, error = "succeeded", json.dumps(result), None
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}", exc_info=True)
+            status, payload, error = "failed", None, str(e)
+
+        now = time.time()
+        # A job cancelled while running keeps its cancelled status, and one
+        # reclaimed by another worker belongs to that worker now
+        if self._transition(
+            job_id,
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ? "
+            "WHERE owner = ? AND job_id = ? AND status = 'running'",
+            (status, payload, error, now, now + settings.jobs_result_ttl_seconds, self._worker_id)
+        ):
+            logger.info(f"Job {job_id} {status}")
+
+
+job_manager = JobManager()
@@ -1,8 +1,12 @@
+import asyncio
+import contextvars
 import logging
-from typing import Dict, Any, Optional, Literal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Literal
 from ..config.settings import settings
 from ..llm_providers.factory import LLMFactory
 from ..llm_providers.base import BaseLLM
+from ..llm_providers.circuit_breaker import breaker_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -12,64 +16,181 @@ class LLMService:
     Provides a high-level API for text generation.
     """
 
-    def __init__(self, default_provider: Optional[Literal["groq", "ollama"]] = None):
+    def __init__(self, default_provider: Optional[Literal["groq", "ollama", "fake"]] = None):
         self.default_provider = default_provider or settings.llm_provider
-        # Lazy initialization or factory call per request to support runtime overrides
-        self._default_llm = None
 
     @property
     def default_llm(self) -> BaseLLM:
-        if self._default_llm is None:
-            self._default_llm = LLMFactory.create(provider=self.default_provider)
-        return self._default_llm
+        # Resolved through the factory registry so invalidation is honoured
+        return LLMFactory.create(provider=self.default_provider)
+
+    def _resolve_llm(self, provider: Optional[str], hedged: bool = False) -> BaseLLM:
+        # Resolve LLM instance (from request or default)
+        return LLMFactory.create(provider=provider or self.default_provider, hedged=hedged)
+
+    @staticmethod
+    def provider_health() -> Dict[str, Any]:
+        """Circuit breaker state and rolling error rate / latency per provider."""
+        return {
+            "routing_enabled": settings.llm_routing_enabled,
+            "providers": breaker_snapshots()
+        }
+
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Match existing response format
+        if result.get("status") == "success":
+            return {
+                "content": result["content"],
+                "model": result["model"],
+                "status": "success"
+            }
+        return {
+            "error": result.get("content", "Unknown error"),
+            "details": [result.get("error", "Unknown error")],
+            "status": "failure"
+        }
+
+    @staticmethod
+    def _format_exception(e: Exception) -> Dict[str, Any]:
+        logger.error(f"LLM Service generation failed: {e}")
+        return {
+            "error": "LLM service temporarily unavailable",
+            "details": [str(e)],
+            "status": "failure"
+        }
 
     def generate_response(
         self, 
         prompt: str, 
-        provider: Optional[Literal["groq", "ollama"]] = None,
+        provider: Optional[Literal["groq", "ollama", "fake"]] = None,
+        hedged: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Main entrypoint: Uses Factory to select provider.
+        hedged: race a second provider on slow calls (see llm_hedging_enabled).
         """
         try:
-            # Resolve LLM instance (from request or default)
-            llm = LLMFactory.create(provider=provider) if provider else self.default_llm
-            
+            llm = self._resolve_llm(provider, hedged)
             logger.info(f"🔵 Generating response using provider: {provider or self.default_provider}")
-            result = llm.generate(prompt, **kwargs)
-            
-            # Match existing response format
-            if result.get("status") == "success":
-                return {
-                    "content": result["content"],
-                    "model": result["model"],
-                    "status": "success"
-                }
-            else:
-                return {
-                    "error": result.get("content", "Unknown error"),
-                    "details": [result.get("error", "Unknown error")],
-                    "status": "failure"
-                }
+            return self._format_result(llm.generate(prompt, **kwargs))
+        except Exception as e:
+            return self._format_exception(e)
 
+    async def agenerate_response(
+        self,
+        prompt: str,
+        provider: Optional[Literal["groq", "ollama", "fake"]] = None,
+        hedged: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async entrypoint: same contract as generate_response, using the
+        provider's native agenerate().
+        """
+        try:
+            llm = self._resolve_llm(provider, hedged)
+            logger.info(f"🔵 Generating async response using provider: {provider or self.default_provider}")
+            return self._format_result(await llm.agenerate(prompt, **kwargs))
         except Exception as e:
-            logger.error(f"LLM Service generation failed: {e}")
-            return {
-                "error": "LLM service temporarily unavailable",
-                "details": [str(e)],
-                "status": "failure"
-            }
+            return self._format_exception(e)
+
+    # -----------------------------
+    # Batch generation
+    # -----------------------------
+
+    def _generate_one(self, llm: BaseLLM, prompt: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self._format_result(llm.generate(prompt, **kwargs))
+        except Exception as e:
+            return self._format_exception(e)
+
+    async def _agenerate_one(self, llm: BaseLLM, prompt: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self._format_result(await llm.agenerate(prompt, **kwargs))
+        except Exception as e:
+            return self._format_exception(e)
+
+    def generate_many(
+        self,
+        prompts: List[str],
+        provider: Optional[Literal["groq", "ollama", "fake"]] = None,
+        max_concurrency: Optional[int] = None,
+        hedged: bool = False,
+        llm: Optional[BaseLLM] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several prompts with at most max_concurrency in flight
+        (llm_batch_max_concurrency by default). Results are in prompt order,
+        each in the generate_response format, so one failure does not fail
+        the batch. Provider rate limits still apply per call.
+        llm: explicit instance (e.g. an agent's injected LLM) instead of provider.
+        """
+        if not prompts:
+            return []
+        llm = llm or self._resolve_llm(provider, hedged)
+        workers = max(1, min(max_concurrency or settings.llm_batch_max_concurrency, len(prompts)))
+        logger.info(f"🔵 Generating batch of {len(prompts)} | concurrency={workers}")
+        if workers == 1:
+            return [self._generate_one(llm, p, kwargs) for p in prompts]
+
+        # Each call keeps the caller's deadline and trace
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as pool:
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._generate_one, llm, p, kwargs)
+                for p in prompts
+            ]
+            return [f.result() for f in futures]
+
+    async def agenerate_many(
+        self,
+        prompts: List[str],
+        provider: Optional[Literal["groq", "ollama", "fake"]] = None,
+        max_concurrency: Optional[int] = None,
+        hedged: bool = False,
+        llm: Optional[BaseLLM] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of generate_many, using the provider's native agenerate()."""
+        if not prompts:
+            return []
+        llm = llm or self._resolve_llm(provider, hedged)
+        workers = max(1, max_concurrency or settings.llm_batch_max_concurrency)
+        limit = asyncio.Semaphore(workers)
+        logger.info(f"🔵 Generating async batch of {len(prompts)} | concurrency={workers}")
+
+        async def one(prompt: str) -> Dict[str, Any]:
+            async with limit:
+                return await self._agenerate_one(llm, prompt, kwargs)
+
+        return list(await asyncio.gather(*(one(p) for p in prompts)))
 
 # Singleton instance for legacy support
 llm_service = LLMService()
 
-def ask_llm(prompt: str, provider: Optional[Literal["groq", "ollama"]] = None) -> str:
+def ask_llm(
+    prompt: str, provider: Optional[Literal["groq", "ollama", "fake"]] = None, hedged: bool = False, **kwargs
+) -> str:
     """Helper function for backward compatibility"""
-    result = llm_service.generate_response(prompt, provider=provider)
+    result = llm_service.generate_response(prompt, provider=provider, hedged=hedged, **kwargs)
     
     if result.get("status") == "success":
         return result["content"]
     
     import json
     return json.dumps(result)
+
+
+async def aask_llm(
+    prompt: str, provider: Optional[Literal["groq", "ollama", "fake"]] = None, hedged: bool = False, **kwargs
+) -> str:
+    """Async counterpart of ask_llm"""
+    result = await llm_service.agenerate_response(prompt, provider=provider, hedged=hedged, **kwargs)
+
+    if result.get("status") == "success":
+        return result["content"]
+
+    import json
+    return json.dumps(result)
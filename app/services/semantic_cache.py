@@ -0,0 +1,232 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+from ..llm_providers.cache import cache_bypass
+from ..utils.cassette import cassette
+from ..utils.metrics import record_cache_lookup
+from ..utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Questions whose embedding is kept between a lookup miss and its store
+_RECENT_EMBEDDINGS = 256
+
+
+class SemanticAnswerCache:
+    """
+    Answer cache for the orchestration graph keyed on question embeddings.
+
+    Each graph mode gets its own Chroma collection (HNSW, cosine space), so
+    lookups stay logarithmic at hundreds of thousands of entries. A hit is
+    the nearest unexpired answer for the same mode and provider whose
+    similarity clears semantic_cache_threshold.
+
+    The embedder and Chroma client are created on first use; if either is
+    unavailable the cache disables itself and every lookup is a miss. It is
+    also off while a cassette records or replays, since persisted answers
+    would keep the graph's calls off the tape.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._embedder = None
+        self._collections: Dict[str, Any] = {}
+        self._disabled = not settings.semantic_cache_enabled
+        self._stores_since_prune = 0
+        self._embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+
+    def enabled_for(self, mode: str) -> bool:
+        return not self._disabled and not cassette.active and mode in settings.semantic_cache_modes
+
+    def _ensure(self) -> bool:
+        if self._disabled:
+            return False
+        if self._client is not None:
+            return True
+        with self._lock:
+            if self._client is None and not self._disabled:
+                try:
+                    import chromadb
+                    from ..rag.embedder import Embedder
+                    self._embedder = Embedder()
+                    self._client = chromadb.PersistentClient(path=settings.semantic_cache_persist_dir)
+                    logger.info(f"Semantic answer cache at {settings.semantic_cache_persist_dir}")
+                except Exception as e:
+                    logger.error(f"Semantic answer cache unavailable, disabling: {e}")
+                    self._disabled = True
+        return not self._disabled
+
+    def _collection(self, mode: str):
+        collection = self._collections.get(mode)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.get(mode)
+                if collection is None:
+                    collection = self._client.get_or_create_collection(
+                        name=f"semantic_answers_{mode}",
+                        metadata={"hnsw:space": "cosine"}
+                    )
+                    self._collections[mode] = collection
+        return collection
+
+    def _embed(self, question: str) -> List[float]:
+        """Embedding of question; a miss's store() reuses the one its lookup() computed."""
+        with self._lock:
+            embedding = self._embeddings.get(question)
+            if embedding is not None:
+                self._embeddings.move_to_end(question)
+                return embedding
+        embedding = self._embedder.embed_query(question)
+        with self._lock:
+            self._embeddings[question] = embedding
+            while len(self._embeddings) > _RECENT_EMBEDDINGS:
+                self._embeddings.popitem(last=False)
+        return embedding
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+        if stat in ("hits", "misses"):
+            record_cache_lookup("semantic", stat == "hits")
+
+    def lookup(self, question: str, mode: str, provider: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached graph result for a semantically equivalent question, or None."""
+        if not self.enabled_for(mode):
+            return None
+        if cache_bypass.get():
+            self._count("bypassed")
+            return None
+        if not self._ensure():
+            return None
+
+        try:
+            embedding = self._embed(question)
+            with span("vector.query", collection=f"semantic_answers_{mode}", n_results=1):
+                results = self._collection(mode).query(
+                    query_embeddings=[embedding],
+                    n_results=1,
+                    where={"$and": [
+                        {"provider": provider or "default"},
+                        {"expires_at": {"$gt": time.time()}}
+                    ]}
+                )
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            self._count("misses")
+            return None
+
+        ids = results.get("ids") or [[]]
+        if not ids[0]:
+            self._count("misses")
+            return None
+
+        # Cosine distance -> similarity
+        similarity = 1.0 - results["distances"][0][0]
+        if similarity < settings.semantic_cache_threshold:
+            self._count("misses")
+            return None
+
+        metadata = results["metadatas"][0][0]
+        payload = json.loads(metadata["payload"])
+        payload["question"] = question
+        payload["semantic_cache"] = {
+            "hit": True,
+            "similarity": round(similarity, 4),
+            "age_seconds": round(time.time() - metadata["created_at"], 1)
+        }
+        self._count("hits")
+        logger.info(f"Semantic cache hit | mode={mode} | similarity={similarity:.3f}")
+        return payload
+
+    def store(self, question: str, mode: str, result: Dict[str, Any], provider: Optional[str] = None):
+        """Remember a graph result. Degraded results are never cached."""
+        if not self.enabled_for(mode) or result.get("degraded") or not self._ensure():
+            return
+
+        payload = {k: v for k, v in result.items() if k not in ("timings", "semantic_cache")}
+        now = time.time()
+        try:
+            self._collection(mode).add(
+                ids=[str(uuid.uuid4())],
+                documents=[question],
+                embeddings=[self._embed(question)],
+                metadatas=[{
+                    "provider": provider or "default",
+                    "created_at": now,
+                    "expires_at": now + settings.semantic_cache_ttl_seconds,
+                    "payload": json.dumps(payload)
+                }]
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+            return
+
+        self._count("stores")
+        with self._lock:
+            self._stores_since_prune += 1
+            due = self._stores_since_prune >= settings.semantic_cache_prune_every
+            if due:
+                self._stores_since_prune = 0
+        if due:
+            self.prune(mode)
+
+    def prune(self, mode: Optional[str] = None) -> int:
+        """Drop expired entries; returns how many were removed."""
+        if not self._ensure():
+            return 0
+        removed = 0
+        for name in self._modes(mode):
+            collection = self._collection(name)
+            try:
+                expired = collection.get(where={"expires_at": {"$lte": time.time()}}, include=[])
+                if expired["ids"]:
+                    collection.delete(ids=expired["ids"])
+                    removed += len(expired["ids"])
+            except Exception as e:
+                logger.warning(f"Semantic cache prune failed for mode={name}: {e}")
+        return removed
+
+    def invalidate(self, mode: Optional[str] = None, provider: Optional[str] = None) -> int:
+        """
+        Drop cached answers for one mode (or all modes), optionally only
+        those produced by one provider. Returns how many were removed.
+        """
+        if not self._ensure():
+            return 0
+        removed = 0
+        for name in self._modes(mode):
+            collection = self._collection(name)
+            try:
+                where = {"provider": provider} if provider else None
+                entries = collection.get(where=where, include=[])
+                if entries["ids"]:
+                    collection.delete(ids=entries["ids"])
+                    removed += len(entries["ids"])
+            except Exception as e:
+                logger.warning(f"Semantic cache invalidation failed for mode={name}: {e}")
+        logger.info(f"Semantic cache invalidated | mode={mode or 'all'} | removed={removed}")
+        return removed
+
+    def _modes(self, mode: Optional[str]) -> List[str]:
+        return [mode] if mode else list(settings.semantic_cache_modes)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["enabled"] = not self._disabled
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        if self._client is not None:
+            stats["entries"] = {m: self._collection(m).count() for m in settings.semantic_cache_modes}
+        return stats
+
+
+semantic_cache = SemanticAnswerCache()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from datetime import datetime
@@ -6,7 +7,7 @@ from typing import Dict, Any, List, Optional
 from .memory_store import MemoryStore
 from .embedding_manager import EmbeddingIndexManager
 from .task_manager import ActiveTaskManager
-from ..graphs.orchestration_graph import run_graph
+from ..graphs.orchestration_graph import run_graph, arun_graph
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -75,6 +76,44 @@ class ConversationStateManager:
             answer
         )
 
+    async def ahandle_message(
+        self,
+        user_id: str,
+        conversation_id: str,
+        text: str,
+        provider: str = "groq",
+    ) -> Dict[str, Any]:
+        """Async counterpart of handle_message; disk and embedding work stays off the loop."""
+
+        state = await asyncio.to_thread(self._load_state, user_id, conversation_id)
+
+        memory_updates = await self._aextract_memory(text)
+        if memory_updates:
+            await asyncio.to_thread(self._apply_memory_updates, state, memory_updates)
+            await asyncio.to_thread(self._persist_state, user_id, conversation_id, state)
+
+            return self._build_response(
+                text,
+                "memory_update",
+                "Your information has been securely stored."
+            )
+
+        recall = await self._asemantic_recall(state, text)
+        if recall:
+            return self._build_response(
+                text,
+                "memory_recall",
+                recall
+            )
+
+        answer = await self._ageneral_chat_with_context(state, text, provider)
+
+        return self._build_response(
+            text,
+            "general_chat",
+            answer
+        )
+
     # =====================================================
     # LOAD STATE
     # =====================================================
@@ -100,7 +139,29 @@ class ConversationStateManager:
     # =====================================================
     def _extract_memory(self, text: str) -> List[Dict[str, Any]]:
 
-        prompt = f"""
+        try:
+            from .llm_service import llm_service
+            res = llm_service.generate_response(self._extraction_prompt(text), temperature=0)
+            return self._parse_memory_updates(res)
+
+        except Exception as e:
+            logger.error(f"Memory extraction failed: {e}")
+            return []
+
+    async def _aextract_memory(self, text: str) -> List[Dict[str, Any]]:
+
+        try:
+            from .llm_service import llm_service
+            res = await llm_service.agenerate_response(self._extraction_prompt(text), temperature=0)
+            return self._parse_memory_updates(res)
+
+        except Exception as e:
+            logger.error(f"Memory extraction failed: {e}")
+            return []
+
+    def _extraction_prompt(self, text: str) -> str:
+
+        return f"""
 Extract personal information from the message.
 
 Return STRICT JSON only.
@@ -118,35 +179,30 @@ Message:
 {text}
 """
 
-        try:
-            from .llm_service import llm_service
-            res = llm_service.generate_response(prompt, temperature=0)
-            parsed = self._safe_json_parse(res.get("content", "{}"))
+    def _parse_memory_updates(self, res: Dict[str, Any]) -> List[Dict[str, Any]]:
 
-            updates = []
+        parsed = self._safe_json_parse(res.get("content", "{}"))
 
-            for category in ["identity", "preferences", "facts"]:
-                category_data = parsed.get(category, {})
-                if isinstance(category_data, dict):
-                    for key, value in category_data.items():
-                        if isinstance(value, str) and value.strip():
+        updates = []
 
-                            normalized = CANONICAL_KEYS.get(
-                                key.strip(),
-                                key.strip()
-                            )
+        for category in ["identity", "preferences", "facts"]:
+            category_data = parsed.get(category, {})
+            if isinstance(category_data, dict):
+                for key, value in category_data.items():
+                    if isinstance(value, str) and value.strip():
 
-                            updates.append({
-                                "category": category,
-                                "key": normalized,
-                                "value": value.strip()
-                            })
+                        normalized = CANONICAL_KEYS.get(
+                            key.strip(),
+                            key.strip()
+                        )
 
-            return updates
+                        updates.append({
+                            "category": category,
+                            "key": normalized,
+                            "value": value.strip()
+                        })
 
-        except Exception as e:
-            logger.error(f"Memory extraction failed: {e}")
-            return []
+        return updates
 
     # =====================================================
     # APPLY MEMORY UPDATES
@@ -170,6 +226,36 @@ Message:
     # =====================================================
     def _semantic_recall(self, state, text) -> Optional[str]:
 
+        prompt = self._recall_prompt(state, text)
+        if not prompt:
+            return None
+
+        try:
+            from .llm_service import llm_service
+            res = llm_service.generate_response(prompt, temperature=0)
+            return self._parse_recall(res)
+
+        except Exception as e:
+            logger.error(f"Recall failure: {e}")
+            return None
+
+    async def _asemantic_recall(self, state, text) -> Optional[str]:
+
+        prompt = self._recall_prompt(state, text)
+        if not prompt:
+            return None
+
+        try:
+            from .llm_service import llm_service
+            res = await llm_service.agenerate_response(prompt, temperature=0)
+            return self._parse_recall(res)
+
+        except Exception as e:
+            logger.error(f"Recall failure: {e}")
+            return None
+
+    def _recall_prompt(self, state, text) -> Optional[str]:
+
         memory = {}
         for category in ["identity", "preferences", "facts"]:
             memory.update(state.get(category, {}))
@@ -179,7 +265,7 @@ Message:
 
         memory_block = "\n".join([f"{k}: {v}" for k, v in memory.items()])
 
-        prompt = f"""
+        return f"""
 You are a memory reasoning engine.
 
 Stored information:
@@ -202,44 +288,75 @@ Rules:
 - Do not hallucinate
 """
 
-        try:
-            from .llm_service import llm_service
-            res = llm_service.generate_response(prompt, temperature=0)
+    def _parse_recall(self, res: Dict[str, Any]) -> Optional[str]:
 
-            parsed = self._safe_json_parse(res.get("content", "{}"))
+        parsed = self._safe_json_parse(res.get("content", "{}"))
 
-            if not parsed.get("relevant"):
-                return None
-
-            if parsed.get("confidence", 0) < 0.6:
-                return None
-
-            answer = parsed.get("answer", "").strip()
+        if not parsed.get("relevant"):
+            return None
 
-            if not answer:
-                return None
+        if parsed.get("confidence", 0) < 0.6:
+            return None
 
-            return answer
+        answer = parsed.get("answer", "").strip()
 
-        except Exception as e:
-            logger.error(f"Recall failure: {e}")
+        if not answer:
             return None
 
+        return answer
+
     # =====================================================
     # GENERAL CHAT
     # =====================================================
     def _general_chat_with_context(self, state, text, provider):
 
+        try:
+            question = self._contextual_question(state, text)
+            graph_result = run_graph(
+                question=question,
+                mode="chat",
+                provider=provider,
+                # Questions carrying the user's memory must not be shared via the semantic cache
+                use_cache=question == text
+            )
+
+            return self._sanitize_graph_output(graph_result)
+
+        except Exception as e:
+            logger.error(f"Graph error: {e}")
+            return "Something went wrong."
+
+    async def _ageneral_chat_with_context(self, state, text, provider):
+
+        try:
+            question = self._contextual_question(state, text)
+            graph_result = await arun_graph(
+                question=question,
+                mode="chat",
+                provider=provider,
+                use_cache=question == text
+            )
+
+            return self._sanitize_graph_output(graph_result)
+
+        except Exception as e:
+            logger.error(f"Graph error: {e}")
+            return "Something went wrong."
+
+    def _contextual_question(self, state, text) -> str:
+
         memory = {}
         for category in ["identity", "preferences", "facts"]:
             memory.update(state.get(category, {}))
 
-        if memory:
-            memory_block = "\n".join(
-                [f"{k}: {v}" for k, v in memory.items()]
-            )
+        if not memory:
+            return text
+
+        memory_block = "\n".join(
+            [f"{k}: {v}" for k, v in memory.items()]
+        )
 
-            text = f"""
+        return f"""
 You are a helpful assistant.
 
 User context:
@@ -251,19 +368,6 @@ User message:
 {text}
 """
 
-        try:
-            graph_result = run_graph(
-                question=text,
-                mode="chat",
-                provider=provider
-            )
-
-            return self._sanitize_graph_output(graph_result)
-
-        except Exception as e:
-            logger.error(f"Graph error: {e}")
-            return "Something went wrong."
-
     # =====================================================
     # GRAPH OUTPUT SANITIZER
     # =====================================================
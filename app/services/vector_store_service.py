@@ -2,6 +2,7 @@ import chromadb
 from chromadb.config import Settings as ChromaSettings
 from ..config.settings import settings
 from ..rag.embedder import Embedder
+from ..utils.tracing import span
 import logging
 import uuid
 
@@ -88,10 +89,11 @@ class VectorStoreService:
             query_embedding = self.embedder.embed_query(query_text)
 
             # Search
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results
-            )
+            with span("vector.query", collection=settings.collection_name, n_results=n_results):
+                results = self.collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results
+                )
 
             return results
 
@@ -1,17 +1,37 @@
 from ddgs import DDGS
 from app.utils.logger import get_logger
+from app.utils.singleflight import SingleFlight
+from app.config.settings import settings
+from app.tools.research_cache import ResearchSourceError, research_cache, normalize_query
+from app.utils.tracing import traced
+from app.utils.cassette import cassette
 
 logger = get_logger("DuckDuckGoTool")
 
+duckduckgo_flight = SingleFlight("duckduckgo")
+
+@traced("tool.duckduckgo")
 def duckduckgo_search(query: str, max_results: int = 5) -> list:
     """
     Search DuckDuckGo and return structured data with title, body, and URL.
-    Uses modern ddgs package.
+    Uses modern ddgs package. Results are cached by normalized query, and
+    concurrent identical queries share a single upstream search.
     
     Returns:
         list of dicts with keys: title, body, url
         Empty list [] if search fails
     """
+    key = f"{max_results}:{normalize_query(query)}"
+    loader = lambda: _duckduckgo_search(query, max_results)
+    try:
+        if settings.request_coalescing_enabled:
+            return duckduckgo_flight.do(key, research_cache.fetch, "duckduckgo", key, loader)
+        return research_cache.fetch("duckduckgo", key, loader)
+    except ResearchSourceError:
+        return []
+
+@cassette.recorded("tool.duckduckgo")
+def _duckduckgo_search(query: str, max_results: int = 5) -> list:
     try:
         results = []
         with DDGS() as ddgs:
@@ -29,4 +49,5 @@ def duckduckgo_search(query: str, max_results: int = 5) -> list:
 
     except Exception as e:
         logger.warning(f"DuckDuckGo failed: {e}")
-        return []
+        # Network errors and rate limits; the caller sees [] but nothing is cached
+        raise ResearchSourceError(str(e)) from e
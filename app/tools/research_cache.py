@@ -0,0 +1,74 @@
+import sqlite3
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import settings
+from app.utils.cassette import cassette
+from app.utils.ttl_cache import TieredTTLCache, _MISSING
+from app.utils.logger import get_logger
+
+logger = get_logger("ResearchCache")
+
+
+class ResearchSourceError(Exception):
+    """A research source failed (network, rate limit); unlike an empty result, never cached."""
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.lower().split())
+
+
+class ResearchCache(TieredTTLCache):
+    """
+    Cache for research tool results keyed by source and normalized query.
+    Each source has its own TTL; empty results (the source answered, with
+    nothing) are cached negatively with a short TTL. A loader raising
+    ResearchSourceError caches nothing, so a transient outage does not
+    blank research for that query.
+
+    While a cassette records or replays, the disk tier is skipped: results
+    persisted by earlier runs would keep calls off the tape, and replayed
+    results must not land in the real cache.
+    """
+
+    def __init__(self):
+        super().__init__(
+            "research",
+            max_entries=settings.research_cache_max_entries,
+            default_ttl=settings.research_cache_web_ttl,
+            disk_path=settings.research_cache_disk_path if settings.research_cache_disk_enabled else None
+        )
+        self.source_ttls: Dict[str, float] = {
+            "wikipedia": settings.research_cache_wiki_ttl,
+            "duckduckgo": settings.research_cache_web_ttl,
+        }
+        self._stats["negative_stores"] = 0
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        return None if cassette.active else self._db
+
+    def fetch(self, source: str, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached result for (source, key), loading and storing it on a miss."""
+        if not settings.research_cache_enabled:
+            return loader()
+
+        cache_key = f"{source}:{key}"
+        value = self.lookup(cache_key)
+        if value is not _MISSING:
+            return value
+
+        try:
+            value = loader()
+        except ResearchSourceError:
+            self._count("failures")
+            raise
+        if value:
+            self.set(cache_key, value, ttl=self.source_ttls.get(source, self.default_ttl))
+        else:
+            self.set(cache_key, value, ttl=settings.research_cache_negative_ttl)
+            self._count("negative_stores")
+        return value
+
+
+# Singleton instance shared by all research tools
+research_cache = ResearchCache()
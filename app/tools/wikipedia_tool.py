@@ -1,16 +1,52 @@
 import wikipedia
+from concurrent.futures import ThreadPoolExecutor
 from app.utils.logger import get_logger
+from app.utils.singleflight import SingleFlight
+from app.config.settings import settings
+from app.tools.research_cache import ResearchSourceError, research_cache, normalize_query
+from app.utils.tracing import traced
+from app.utils.cassette import cassette
 
 logger = get_logger("WikipediaTool")
 
+wikipedia_flight = SingleFlight("wikipedia")
+
+# page() and summary() are independent lookups; run them side by side
+_lookup_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="wikipedia")
+
+def _fetch_page(title: str) -> dict:
+    page_future = _lookup_pool.submit(wikipedia.page, title)
+    summary_future = _lookup_pool.submit(wikipedia.summary, title, sentences=5)
+    page = page_future.result()
+    summary = summary_future.result()
+    return {
+        "title": title,
+        "summary": summary,
+        "url": page.url
+    }
+
+@traced("tool.wikipedia")
 def wikipedia_search(query: str) -> dict:
     """
     Search Wikipedia and return structured data with title, summary, and URL.
+    Results are cached by normalized query, and concurrent identical
+    queries share a single upstream lookup.
     
     Returns:
         dict with keys: title, summary, url
         Empty dict {} if search fails
     """
+    key = normalize_query(query)
+    loader = lambda: _wikipedia_search(query)
+    try:
+        if settings.request_coalescing_enabled:
+            return wikipedia_flight.do(key, research_cache.fetch, "wikipedia", key, loader)
+        return research_cache.fetch("wikipedia", key, loader)
+    except ResearchSourceError:
+        return {}
+
+@cassette.recorded("tool.wikipedia")
+def _wikipedia_search(query: str) -> dict:
     try:
         # Search for the most relevant page first to avoid "Page id does not match" errors
         search_results = wikipedia.search(query)
@@ -20,29 +56,18 @@ def wikipedia_search(query: str) -> dict:
         
         # Use the first search result title
         page_title = search_results[0]
-        page = wikipedia.page(page_title)
-        summary = wikipedia.summary(page_title, sentences=5)
+        result = _fetch_page(page_title)
         
         logger.info(f"📘 Wikipedia search completed for: {page_title}")
         
-        return {
-            "title": page_title,
-            "summary": summary,
-            "url": page.url
-        }
+        return result
 
     except wikipedia.exceptions.DisambiguationError as e:
         logger.warning(f"Wikipedia disambiguation error for '{query}': {e.options}")
         # Try the first result from disambiguation options
         try:
             first_option = e.options[0]
-            page = wikipedia.page(first_option)
-            summary = wikipedia.summary(first_option, sentences=5)
-            return {
-                "title": first_option,
-                "summary": summary,
-                "url": page.url
-            }
+            return _fetch_page(first_option)
         except:
             return {}
     except wikipedia.exceptions.PageError:
@@ -50,4 +75,5 @@ def wikipedia_search(query: str) -> dict:
         return {}
     except Exception as e:
         logger.warning(f"Wikipedia failed unexpectedly: {e}")
-        return {}
+        # Most likely network trouble; the caller sees {} but nothing is cached
+        raise ResearchSourceError(str(e)) from e
@@ -0,0 +1,173 @@
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("Cassette")
+
+
+def request_key(kind: str, *parts: Any) -> str:
+    """Stable hash of a call: its kind plus every argument that shapes the answer."""
+    raw = json.dumps([kind, *parts], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class CassetteMiss(LookupError):
+    """Raised in strict replay when a call was never recorded."""
+
+
+class Cassette:
+    """
+    Record/replay of upstream calls (LLM providers, research tools).
+
+    In "record" mode every call goes upstream and one JSON line is appended
+    per call: kind, request hash, latency and response. In "replay" mode the
+    cassette answers instead of the network, sleeping for the recorded
+    latency (scaled by cassette_latency_scale) so timings stay realistic.
+    Calls recorded several times under the same hash replay in recorded
+    order, wrapping around. A replay miss raises CassetteMiss in strict mode
+    and goes upstream otherwise.
+
+    Mode changes at runtime need LLMFactory.invalidate(), since providers
+    are only wrapped when built.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tapes: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._cursors: Dict[str, int] = {}
+        self._loaded_from: Optional[str] = None
+        self._stats = {"recorded": 0, "replayed": 0, "misses": 0}
+
+    @property
+    def mode(self) -> str:
+        return settings.cassette_mode
+
+    @property
+    def active(self) -> bool:
+        return self.mode in ("record", "replay")
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        path = settings.cassette_path
+        if self._tapes is not None and self._loaded_from == path:
+            return self._tapes
+
+        tapes: Dict[str, List[Dict[str, Any]]] = {}
+        if Path(path).exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    tapes.setdefault(entry["key"], []).append(entry)
+        else:
+            logger.warning(f"Cassette {path} not found; every call will miss")
+        self._tapes, self._loaded_from, self._cursors = tapes, path, {}
+        logger.info(f"Loaded cassette {path} | {sum(map(len, tapes.values()))} calls")
+        return tapes
+
+    def _append(self, entry: Dict[str, Any]):
+        path = Path(settings.cassette_path)
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._stats["recorded"] += 1
+
+    def reload(self):
+        """Forget loaded tapes so the next replay re-reads the cassette file."""
+        with self._lock:
+            self._tapes = None
+
+    # -----------------------------
+    # Record / replay primitives
+    # -----------------------------
+
+    def record(self, kind: str, key: str, latency: float, response: Any, **meta):
+        entry = {"kind": kind, "key": key, "latency": round(latency, 4), "response": response}
+        entry.update(meta)
+        self._append(entry)
+
+    def find(self, kind: str, key: str) -> Optional[Tuple[Any, float]]:
+        """Next recorded (response, delay) for key, or None on a non-strict miss."""
+        with self._lock:
+            entries = self._load().get(key)
+            if not entries:
+                self._stats["misses"] += 1
+            else:
+                index = self._cursors.get(key, 0)
+                self._cursors[key] = index + 1
+                entry = entries[index % len(entries)]
+                self._stats["replayed"] += 1
+                return entry["response"], entry["latency"] * settings.cassette_latency_scale
+
+        if settings.cassette_replay_strict:
+            raise CassetteMiss(f"No recorded {kind} call for key {key}")
+        logger.warning(f"Cassette miss for {kind} ({key}); calling upstream")
+        return None
+
+    def call(self, kind: str, key: str, fn: Callable[[], Any], **meta) -> Any:
+        """Run a sync call through the cassette."""
+        if self.mode == "replay":
+            hit = self.find(kind, key)
+            if hit is not None:
+                response, delay = hit
+                if delay > 0:
+                    time.sleep(delay)
+                return response
+
+        start = time.perf_counter()
+        response = fn()
+        if self.mode == "record":
+            self.record(kind, key, time.perf_counter() - start, response, **meta)
+        return response
+
+    async def acall(self, kind: str, key: str, fn: Callable[[], Any], **meta) -> Any:
+        """Async counterpart of call(); fn returns an awaitable."""
+        if self.mode == "replay":
+            hit = self.find(kind, key)
+            if hit is not None:
+                response, delay = hit
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                return response
+
+        start = time.perf_counter()
+        response = await fn()
+        if self.mode == "record":
+            self.record(kind, key, time.perf_counter() - start, response, **meta)
+        return response
+
+    def recorded(self, kind: str):
+        """Decorator routing a sync function through the cassette, keyed by its arguments."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.active:
+                    return fn(*args, **kwargs)
+                key = request_key(kind, args, kwargs)
+                return self.call(kind, key, lambda: fn(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(mode=self.mode, path=settings.cassette_path)
+        return stats
+
+
+# Singleton shared by the provider wrapper and the research tools
+cassette = Cassette()
@@ -0,0 +1,63 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class Deadline:
+    """An absolute point in time by which a request must finish."""
+
+    def __init__(self, seconds: float):
+        self.total = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def budget(self, share: Optional[float]) -> float:
+        """A stage's slice of the total budget, capped by what is left."""
+        if share is None:
+            return self.remaining()
+        return min(self.total * share, self.remaining())
+
+
+# The deadline of the request being served, if any. Propagates to asyncio
+# tasks and asyncio.to_thread automatically; thread pools need copy_context().
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """
+    Time left on the current deadline, capped by default.
+    Returns default unchanged when no deadline is active.
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Activate a deadline for the enclosed block. An already active, tighter
+    deadline is kept so nested scopes can only shrink the budget.
+    """
+    outer = current_deadline.get()
+    if seconds is None:
+        yield outer
+        return
+
+    deadline = Deadline(seconds)
+    if outer is not None and outer.expires_at < deadline.expires_at:
+        deadline = outer
+
+    token = current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        current_deadline.reset(token)
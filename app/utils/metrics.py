@@ -0,0 +1,133 @@
+import os
+from typing import Any, Dict, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .tracing import add_span_observer
+
+# With several uvicorn/gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory before start-up; each worker then writes its samples there
+# and /metrics aggregates all of them. Without it, metrics are per process.
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "humind_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"], buckets=_LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "humind_http_requests_in_flight", "HTTP requests currently being served",
+    multiprocess_mode="livesum"
+)
+LLM_REQUEST_DURATION = Histogram(
+    "humind_llm_request_duration_seconds", "LLM call latency",
+    ["provider", "model", "status"], buckets=_LATENCY_BUCKETS
+)
+LLM_ERRORS = Counter(
+    "humind_llm_errors_total", "LLM calls that returned an error or raised",
+    ["provider", "model"]
+)
+GRAPH_STAGE_DURATION = Histogram(
+    "humind_graph_stage_duration_seconds", "Orchestration graph stage latency",
+    ["stage"], buckets=_LATENCY_BUCKETS
+)
+TOOL_DURATION = Histogram(
+    "humind_tool_duration_seconds", "Research tool call latency",
+    ["tool"], buckets=_LATENCY_BUCKETS
+)
+EMBEDDING_DURATION = Histogram(
+    "humind_embedding_duration_seconds", "Embedding call latency", buckets=_LATENCY_BUCKETS
+)
+EMBEDDING_BATCH_SIZE = Histogram(
+    "humind_embedding_batch_size", "Texts per embedding call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+VECTOR_QUERY_DURATION = Histogram(
+    "humind_vector_query_duration_seconds", "Chroma query latency",
+    ["collection"], buckets=_LATENCY_BUCKETS
+)
+LLM_CIRCUIT_STATE = Gauge(
+    "humind_llm_circuit_state", "Provider circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["provider"], multiprocess_mode="livemax"
+)
+LLM_HEDGES = Counter(
+    "humind_llm_hedges_total", "Hedged LLM calls by outcome (not_fired, primary_won, hedge_won, both_failed)",
+    ["outcome"]
+)
+LLM_QUEUE_DEPTH = Gauge(
+    "humind_llm_queue_depth", "Calls waiting for admission by a client-side rate limiter",
+    ["limiter"], multiprocess_mode="livesum"
+)
+LLM_QUEUE_WAIT = Histogram(
+    "humind_llm_queue_wait_seconds", "Time spent waiting for rate limiter admission",
+    ["limiter"], buckets=_LATENCY_BUCKETS
+)
+LLM_ADMISSION_REJECTED = Counter(
+    "humind_llm_admission_rejected_total", "Calls refused after their maximum admission wait",
+    ["limiter", "reason"]
+)
+OLLAMA_MODEL_LOADED = Gauge(
+    "humind_ollama_model_loaded", "Whether the configured Ollama model is resident (1) or not (0)",
+    ["model"], multiprocess_mode="livemax"
+)
+OLLAMA_MODEL_LOAD_DURATION = Histogram(
+    "humind_ollama_model_load_seconds", "Ollama model load time reported by warm-up and keep-alive preloads",
+    ["model"], buckets=_LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    "humind_cache_lookups_total", "Cache lookups by outcome; hit ratio = hit / (hit + miss)",
+    ["cache", "result"]
+)
+
+
+def _observe_span(name: str, seconds: float, attrs: Dict[str, Any]):
+    """Feed finished tracing spans into the matching metric."""
+    if name in ("llm", "llm.stream"):
+        provider = attrs.get("provider", "")
+        model = attrs.get("model", "")
+        error = attrs.get("error")
+        if error == "CancelledError":
+            # Hedging losers and abandoned requests; not a provider failure
+            status = "cancelled"
+        elif error:
+            status = "error"
+        else:
+            status = attrs.get("status") or ("stream" if name == "llm.stream" else "")
+        LLM_REQUEST_DURATION.labels(provider, model, status).observe(seconds)
+        if status == "error":
+            LLM_ERRORS.labels(provider, model).inc()
+    elif name.startswith("stage."):
+        GRAPH_STAGE_DURATION.labels(name[len("stage."):]).observe(seconds)
+    elif name.startswith("tool."):
+        TOOL_DURATION.labels(name[len("tool."):]).observe(seconds)
+    elif name == "embedding":
+        EMBEDDING_DURATION.observe(seconds)
+        EMBEDDING_BATCH_SIZE.observe(attrs.get("texts", 1))
+    elif name == "vector.query":
+        VECTOR_QUERY_DURATION.labels(attrs.get("collection", "")).observe(seconds)
+
+
+add_span_observer(_observe_span)
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Text exposition of all metrics, aggregated across workers when multiprocess."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
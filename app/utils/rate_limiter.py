@@ -0,0 +1,252 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Deque, Iterator, Optional
+
+from .metrics import LLM_ADMISSION_REJECTED, LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT
+
+
+# Streams report a refused admission in-band with this prefix; like the
+# "rejected" flag on results, it says nothing about the upstream's health
+REJECTED_CHUNK_PREFIX = "Error: not admitted"
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call cannot be admitted within its maximum wait."""
+
+
+class TokenBucket:
+    """
+    Refills at rate_per_minute up to a capacity of one minute's worth.
+    Not locked; RateLimiter serialises access.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_for(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (the level may already be negative)."""
+        self._refill(now)
+        # A request larger than the bucket only has to wait for a full bucket
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float):
+        # May go negative; later callers then wait for the debt to refill
+        self.level -= amount
+
+    def give_back(self, amount: float):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("event", "loop", "future")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+
+    def wake(self):
+        if self.event is not None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(True))
+
+
+class RateLimiter:
+    """
+    Client-side admission for one upstream API: a FIFO concurrency limit
+    plus requests-per-minute and tokens-per-minute buckets. Callers that
+    are over budget wait their turn, for at most max_wait seconds, instead
+    of being sent upstream to collect a 429. Sync and async callers share
+    the same limits. A limit of 0 disables it.
+
+    Token usage is reserved from an estimate on admission and corrected
+    with settle() once the real usage is known.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 0,
+        max_wait: float = 10.0
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+
+    # -----------------------------
+    # Concurrency slots (FIFO hand-off)
+    # -----------------------------
+
+    def _try_slot(self, waiter: Optional[_Waiter]) -> bool:
+        """Take a slot now, or queue waiter. Caller holds the lock."""
+        if not self.max_concurrency or (self._in_flight < self.max_concurrency and not self._waiters):
+            self._in_flight += 1
+            return True
+        if waiter is not None:
+            self._waiters.append(waiter)
+        return False
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Withdraw a waiter after timeout/cancel. True if it had been handed a slot meanwhile."""
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return False
+            except ValueError:
+                return True
+
+    def _release_slot(self):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the next waiter; in-flight count is unchanged
+                self._waiters.popleft().wake()
+            else:
+                self._in_flight = max(0, self._in_flight - 1)
+
+    def _acquire_slot(self, timeout: float) -> bool:
+        waiter = _Waiter(event=threading.Event())
+        with self._lock:
+            if self._try_slot(waiter):
+                return True
+        if waiter.event.wait(timeout):
+            return True
+        return self._abandon(waiter)
+
+    async def _aacquire_slot(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop=loop, future=loop.create_future())
+        with self._lock:
+            if self._try_slot(waiter):
+                return True
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._abandon(waiter)
+        except BaseException:
+            if self._abandon(waiter):
+                self._release_slot()
+            raise
+
+    # -----------------------------
+    # Rate buckets
+    # -----------------------------
+
+    def _reserve(self, tokens: float, budget: float) -> Optional[float]:
+        """Reserve one request and tokens; seconds to wait, or None if over budget."""
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.wait_for(1, now))
+            if self._tokens is not None and tokens > 0:
+                wait = max(wait, self._tokens.wait_for(tokens, now))
+            if wait > budget:
+                return None
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None and tokens > 0:
+                self._tokens.take(tokens)
+            return wait
+
+    def settle(self, reserved: float, used: Optional[float]):
+        """Correct a token reservation once actual usage is known."""
+        if self._tokens is None or used is None:
+            return
+        with self._lock:
+            if used < reserved:
+                self._tokens.give_back(reserved - used)
+            else:
+                self._tokens.take(used - reserved)
+
+    # -----------------------------
+    # Admission
+    # -----------------------------
+
+    def _reject(self, reason: str, waited: float):
+        LLM_ADMISSION_REJECTED.labels(self.name, reason).inc()
+        raise RateLimitExceeded(f"{self.name}: {reason} after waiting {waited:.1f}s")
+
+    @contextmanager
+    def acquire(self, tokens: float = 0, max_wait: Optional[float] = None) -> Iterator[None]:
+        """Block until admitted (or raise RateLimitExceeded); the slot is held for the block."""
+        budget = self.max_wait if max_wait is None else min(max_wait, self.max_wait)
+        start = time.monotonic()
+        LLM_QUEUE_DEPTH.labels(self.name).inc()
+        try:
+            if not self._acquire_slot(budget):
+                self._reject("concurrency", time.monotonic() - start)
+            try:
+                wait = self._reserve(tokens, budget - (time.monotonic() - start))
+                if wait is None:
+                    self._reject("rate", time.monotonic() - start)
+                if wait > 0:
+                    time.sleep(wait)
+            except BaseException:
+                self._release_slot()
+                raise
+        finally:
+            LLM_QUEUE_DEPTH.labels(self.name).dec()
+        LLM_QUEUE_WAIT.labels(self.name).observe(time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    @asynccontextmanager
+    async def aacquire(self, tokens: float = 0, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """Async counterpart of acquire(); waits without blocking the event loop."""
+        budget = self.max_wait if max_wait is None else min(max_wait, self.max_wait)
+        start = time.monotonic()
+        LLM_QUEUE_DEPTH.labels(self.name).inc()
+        try:
+            if not await self._aacquire_slot(budget):
+                self._reject("concurrency", time.monotonic() - start)
+            try:
+                wait = self._reserve(tokens, budget - (time.monotonic() - start))
+                if wait is None:
+                    self._reject("rate", time.monotonic() - start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            except BaseException:
+                self._release_slot()
+                raise
+        finally:
+            LLM_QUEUE_DEPTH.labels(self.name).dec()
+        LLM_QUEUE_WAIT.labels(self.name).observe(time.monotonic() - start)
+        try:
+            yield
+        finally:
+            self._release_slot()
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            for bucket in (self._requests, self._tokens):
+                if bucket is not None:
+                    bucket._refill(now)
+            return {
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "request_budget": round(self._requests.level, 1) if self._requests else None,
+                "token_budget": round(self._tokens.level, 1) if self._tokens else None
+            }
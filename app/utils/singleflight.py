@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """A single in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncCall:
+    """A single in-flight coroutine, run as its own task so no caller's cancellation kills it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs
+    the function, later callers with the same key wait and share its
+    result (or exception). Works for threaded callers via do() and for
+    asyncio callers via ado().
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], _AsyncCall] = {}
+        self._stats = {"executed": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def ado(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        The first caller starts fn as a separate task; every caller, the
+        first included, awaits it through a shield. A cancelled caller only
+        stops waiting; the task is cancelled once nobody is left waiting.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        with self._lock:
+            call = self._async_calls.get(loop_key)
+            if call is None:
+                call = _AsyncCall(loop.create_task(fn(*args, **kwargs)))
+                self._async_calls[loop_key] = call
+                call.task.add_done_callback(lambda task: self._async_done(loop_key, call))
+                self._stats["executed"] += 1
+            else:
+                self._stats["shared"] += 1
+            call.waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                call.waiters -= 1
+                orphaned = call.waiters == 0 and not call.task.done()
+                if orphaned and self._async_calls.get(loop_key) is call:
+                    # Nobody may join a call that is about to be cancelled
+                    del self._async_calls[loop_key]
+            if orphaned:
+                call.task.cancel()
+            raise
+        except BaseException:
+            with self._lock:
+                call.waiters -= 1
+            raise
+        else:
+            with self._lock:
+                call.waiters -= 1
+
+    def _async_done(self, loop_key: Tuple[int, Hashable], call: _AsyncCall):
+        with self._lock:
+            if self._async_calls.get(loop_key) is call:
+                del self._async_calls[loop_key]
+        if not call.task.cancelled():
+            # Mark retrieved so an unobserved failure does not log a warning
+            call.task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls) + len(self._async_calls)
+        return stats
+
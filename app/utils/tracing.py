@@ -0,0 +1,160 @@
+import functools
+import inspect
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed operation; attributes may be added while it is open."""
+
+    __slots__ = ("name", "attrs")
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# Characters not allowed in a Server-Timing metric name
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.\-]")
+
+
+class Trace:
+    """Spans recorded while serving one request. Safe to append from threads."""
+
+    def __init__(self, include_in_body: bool = False):
+        self.origin = time.perf_counter()
+        self.include_in_body = include_in_body
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, attrs: Dict[str, Any]):
+        record = {
+            "name": name,
+            "start_ms": round((start - self.origin) * 1000, 2),
+            "duration_ms": round((end - start) * 1000, 2)
+        }
+        record.update(attrs)
+        with self._lock:
+            self.spans.append(record)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.origin) * 1000, 2)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+        return {"total_ms": self.elapsed_ms(), "spans": spans}
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value. Spans sharing a name are summed so the
+        header stays small; desc carries the call count.
+        """
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for s in self.spans:
+                entry = totals.setdefault(_UNSAFE_NAME.sub("_", s["name"]), [0.0, 0])
+                entry[0] += s["duration_ms"]
+                entry[1] += 1
+        parts = [f'{name};dur={dur:.1f};desc="{count}x"' for name, (dur, count) in totals.items()]
+        parts.append(f"total;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+
+# The trace of the request being served, if any. Like the request deadline
+# it reaches asyncio tasks directly and thread pools via copy_context().
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+@contextmanager
+def trace_scope(include_in_body: bool = False) -> Iterator[Trace]:
+    trace = Trace(include_in_body=include_in_body)
+    token = current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        current_trace.reset(token)
+
+
+# Called as observer(name, seconds, attrs) for every finished span, traced
+# request or not (e.g. to feed metrics).
+_observers: List[Callable[[str, float, Dict[str, Any]], None]] = []
+
+
+def add_span_observer(observer: Callable[[str, float, Dict[str, Any]], None]):
+    _observers.append(observer)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Any]:
+    """
+    Time the enclosed block as a span of the current trace.
+    Without an active trace or observers this is a no-op.
+    """
+    trace = current_trace.get()
+    if trace is None and not _observers:
+        yield _NULL_SPAN
+        return
+
+    active = Span(name, attrs)
+    start = time.perf_counter()
+    try:
+        yield active
+    except BaseException as e:
+        active.attrs["error"] = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        if trace is not None:
+            trace.add(name, start, end, active.attrs)
+        for observer in _observers:
+            try:
+                observer(name, end - start, active.attrs)
+            except Exception:
+                logger.exception(f"Span observer failed for {name}")
+
+
+def traced(name: str):
+    """Decorator form of span() for sync and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def attach_trace(result: Any) -> Any:
+    """Add the current trace as "_trace" to a dict response when it was requested."""
+    trace = current_trace.get()
+    if trace is not None and trace.include_in_body and isinstance(result, dict):
+        result = dict(result)
+        result["_trace"] = trace.as_dict()
+    return result
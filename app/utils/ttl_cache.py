@@ -0,0 +1,139 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TieredTTLCache:
+    """
+    Two-tier cache: in-process LRU with per-entry TTL, optionally backed by
+    SQLite so entries survive restarts and are shared by workers.
+    Values must be JSON-serialisable when the disk tier is enabled.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        default_ttl: float,
+        disk_path: Optional[str] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._db = self._open_db(disk_path) if disk_path else None
+
+    def _open_db(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.commit()
+            logger.info(f"{self.name} cache disk tier at {path}")
+            return conn
+        except Exception as e:
+            logger.error(f"Failed to open {self.name} cache database: {e}")
+            return None
+
+    def lookup(self, key: str) -> Any:
+        """Cached value for key, or the module-level _MISSING sentinel."""
+        value = self._lookup(key)
+        record_cache_lookup(self.name, value is not _MISSING)
+        return value
+
+    def _lookup(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            db = self._disk()
+            if db is not None:
+                try:
+                    row = db.execute(
+                        "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+                    ).fetchone()
+                except Exception as e:
+                    logger.warning(f"{self.name} cache disk read failed: {e}")
+                    row = None
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self._stats["disk_hits"] += 1
+                    return value
+
+            self._stats["misses"] += 1
+            return _MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._stats["stores"] += 1
+            db = self._disk()
+            if db is not None:
+                try:
+                    db.execute(
+                        "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires_at)
+                    )
+                    db.commit()
+                except Exception as e:
+                    logger.warning(f"{self.name} cache disk write failed: {e}")
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """Disk tier used by lookups and stores; subclasses may switch it off."""
+        return self._db
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        # Caller holds the lock
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] = self._stats.get(stat, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache_entries")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,324 @@
+"""
+Asyncio load generator for the HUMIND API.
+
+Drives a weighted mix of endpoints and reports latency percentiles,
+throughput and error rates as JSON. By default the app runs in-process
+(httpx ASGI transport, lifespan included) on the fake LLM provider, so no
+server, GPU or API key is needed:
+
+    python load_test.py --concurrency 16 --duration 30
+    python load_test.py --rate 20 --duration 60 --scenarios chat,fast_chat,qa_answer
+    python load_test.py --base-url http://localhost:8000 --provider groq
+
+Two arrival models:
+  * closed loop (default): --concurrency workers send back to back
+  * open loop (--rate R): Poisson arrivals at R req/s, at most
+    --concurrency in flight; arrivals that find no free slot wait
+
+Fake latency comes from FAKE_LLM_* settings; set CASSETTE_MODE=replay to
+replay recorded traffic instead. Add --unique to defeat the answer caches.
+The rag scenario needs documents uploaded first; leave it out otherwise.
+
+In-process runs are kept off the network and the GPU: Wikipedia and
+DuckDuckGo lookups are replaced by canned results after
+--research-latency-ms (unless a CASSETTE_MODE is set, or --live-research),
+and the semantic cache, which loads the embedding model, is off unless
+SEMANTIC_CACHE_ENABLED is set explicitly.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+QUESTIONS = [
+    "Should a small team adopt Kubernetes?",
+    "Is it worth migrating our monolith to microservices this year?",
+    "Should we build or buy an internal analytics platform?",
+    "What are the trade-offs of moving our database to a managed service?",
+    "Should we expand into the European market next quarter?",
+]
+
+TERMINAL_QUERIES = [
+    "list all files in the current directory",
+    "show disk usage of the home folder",
+    "find python files modified today",
+]
+
+# name -> (method, path, weight, payload builder)
+# Builders get (question, provider) and return the JSON body.
+SCENARIOS: Dict[str, tuple] = {
+    "chat": ("POST", "/agent/chat", 3, lambda q, p: {"question": q, "mode": "chat", "provider": p}),
+    "fast_chat": ("POST", "/agent/chat", 3, lambda q, p: {"question": q, "mode": "fast_chat", "provider": p}),
+    "memory": ("POST", "/chat/chat/memory", 2, lambda q, p: {
+        "user_id": "loadtest", "conversation_id": f"conv-{random.randint(1, 20)}",
+        "question": q, "provider": p
+    }),
+    "rag": ("POST", "/rag/rag", 1, lambda q, p: {"question": q}),
+    "evaluation": ("POST", "/evaluation/evaluation", 1, lambda q, p: {
+        "question_id": "q1", "answer_id": "a1", "original_question": q,
+        "generated_answer": "Adopt it gradually, starting with a pilot project.", "provider": p
+    }),
+    "qa_generate": ("POST", "/qa/generate-questions", 1, lambda q, p: {
+        "keyword": q.split()[-1].rstrip("?"), "num_questions": 3, "provider": p
+    }),
+    "qa_answer": ("POST", "/qa/answer", 1, lambda q, p: {"questions": [q], "provider": p}),
+    "qa_evaluate": ("POST", "/qa/evaluate", 1, lambda q, p: {
+        "questions": [q], "answers": ["Adopt it gradually, starting with a pilot project."]
+    }),
+    "terminal": ("POST", "/agent/terminal", 1, lambda q, p: {
+        "query": random.choice(TERMINAL_QUERIES), "context": {}
+    }),
+}
+
+
+def offline_research(latency: float):
+    """Swap the upstream research fetchers for canned results (below the research cache)."""
+    from app.tools import duckduckgo_tool, wikipedia_tool
+
+    def wikipedia(query: str) -> dict:
+        time.sleep(latency)
+        return {
+            "title": query.title(),
+            "summary": f"{query} is widely discussed; adoption is growing and costs fall with scale.",
+            "url": "https://en.wikipedia.org/wiki/Load_test"
+        }
+
+    def duckduckgo(query: str, max_results: int = 5) -> list:
+        time.sleep(latency)
+        return [
+            {"title": f"{query} ({i + 1})", "body": "Recent coverage and practitioner reports.",
+             "url": f"https://example.com/{i + 1}"}
+            for i in range(min(max_results, 3))
+        ]
+
+    wikipedia_tool._wikipedia_search = wikipedia
+    duckduckgo_tool._duckduckgo_search = duckduckgo
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(s["latency"] for s in samples)
+    errors = sum(1 for s in samples if s["error"])
+    soft_errors = sum(1 for s in samples if s["soft_error"])
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "soft_errors": soft_errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / count * 1000, 1) if count else 0.0,
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        },
+        "status_codes": dict(sorted(
+            {str(code): sum(1 for s in samples if s["status"] == code)
+             for code in {s["status"] for s in samples}}.items()
+        )),
+    }
+
+
+class LoadGenerator:
+    def __init__(self, client: httpx.AsyncClient, scenarios: List[str], provider: Optional[str], unique: bool):
+        self.client = client
+        self.scenarios = scenarios
+        self.weights = [SCENARIOS[name][2] for name in scenarios]
+        self.provider = provider
+        self.unique = unique
+        self.samples: List[Dict[str, Any]] = []
+        self.issued = 0
+        self._counter = itertools.count()
+
+    def _next_request(self):
+        name = random.choices(self.scenarios, weights=self.weights)[0]
+        method, path, _, build = SCENARIOS[name]
+        n = next(self._counter)
+        question = QUESTIONS[n % len(QUESTIONS)]
+        if self.unique:
+            question = f"{question} (run {n})"
+        return name, method, path, build(question, self.provider)
+
+    async def fire(self, record: bool = True):
+        name, method, path, body = self._next_request()
+        status, error, soft_error = 0, None, False
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=body)
+            status = response.status_code
+            if status >= 400:
+                error = f"HTTP {status}"
+            else:
+                # Some routes report failures inside a 200 body
+                try:
+                    payload = response.json()
+                    soft_error = isinstance(payload, dict) and bool(payload.get("error"))
+                except ValueError:
+                    pass
+        except Exception as e:
+            error = type(e).__name__
+        latency = time.perf_counter() - start
+        if record:
+            self.samples.append({
+                "scenario": name, "latency": latency, "status": status,
+                "error": error, "soft_error": soft_error
+            })
+
+    async def closed_loop(self, concurrency: int, stop: Callable[[], bool]):
+        async def worker():
+            while not stop():
+                self.issued += 1
+                await self.fire()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def open_loop(self, rate: float, concurrency: int, stop: Callable[[], bool]):
+        slots = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def one():
+            async with slots:
+                await self.fire()
+
+        while not stop():
+            self.issued += 1
+            task = asyncio.create_task(one())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.sleep(random.expovariate(rate))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="HUMIND load generator")
+    parser.add_argument("--base-url", default=None, help="Target a running server instead of the in-process app")
+    parser.add_argument("--provider", default=None, help="LLM provider to request (default: fake in-process)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrival rate (req/s)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests instead")
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded requests before measuring")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--unique", action="store_true", help="Make every question unique (no cache hits)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--research-latency-ms", type=float, default=150.0,
+                        help="Latency of the canned research results in-process")
+    parser.add_argument("--live-research", action="store_true",
+                        help="In-process: call the real Wikipedia / DuckDuckGo")
+    parser.add_argument("--output", default="load_test_results.json")
+    return parser.parse_args()
+
+
+async def run(args) -> Dict[str, Any]:
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        lifespan = None
+    else:
+        # Settings are read at import, so pick the provider before loading the app
+        os.environ.setdefault("LLM_PROVIDER", args.provider or "fake")
+        os.environ.setdefault("SEMANTIC_CACHE_ENABLED", "false")
+        canned = not args.live_research and os.environ.get("CASSETTE_MODE", "off").lower() == "off"
+        if canned:
+            # Keep canned results out of the persistent research cache
+            os.environ.setdefault("RESEARCH_CACHE_DISK_ENABLED", "false")
+        from main import app
+        if canned:
+            offline_research(args.research_latency_ms / 1000.0)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout
+        )
+        lifespan = app.router.lifespan_context(app)
+
+    provider = args.provider or (None if args.base_url else "fake")
+    generator = LoadGenerator(client, scenarios, provider, args.unique)
+
+    async with client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            for _ in range(args.warmup):
+                await generator.fire(record=False)
+
+            start = time.perf_counter()
+            deadline = start + args.duration
+
+            def stop() -> bool:
+                if args.requests is not None:
+                    return generator.issued >= args.requests
+                return time.perf_counter() >= deadline
+
+            if args.rate:
+                await generator.open_loop(args.rate, args.concurrency, stop)
+            else:
+                await generator.closed_loop(args.concurrency, stop)
+            elapsed = time.perf_counter() - start
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    by_scenario = {}
+    for name in scenarios:
+        samples = [s for s in generator.samples if s["scenario"] == name]
+        if samples:
+            by_scenario[name] = summarize(samples, elapsed)
+
+    return {
+        "config": {
+            "target": args.base_url or "in-process",
+            "provider": provider,
+            "arrival": f"open loop @ {args.rate} req/s" if args.rate else "closed loop",
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "unique_questions": args.unique,
+        },
+        "overall": summarize(generator.samples, elapsed),
+        "scenarios": by_scenario,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    rows = [("overall", report["overall"])] + list(report["scenarios"].items())
+    print(f"\n{'scenario':14} {'reqs':>6} {'rps':>8} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(f"{name:14} {s['requests']:>6} {s['throughput_rps']:>8} {s['error_rate'] * 100:>5.1f}% "
+              f"{lat['p50']:>7.1f}ms {lat['p95']:>7.1f}ms {lat['p99']:>7.1f}ms")
+
+
+def main():
+    args = parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    report = asyncio.run(run(args))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,11 @@ try:
 except ImportError:
     pass
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from contextlib import asynccontextmanager
+from typing import Optional
 import logging
 
 # Routers
@@ -20,6 +23,19 @@ from app.routes.qa_pipeline import router as qa_router
 from app.api.evaluation_routes import router as evaluation_router
 from app.api.memory_routes import router as memory_router
 from app.services.ticket_agent_service import router as booking_router
+from app.api.job_routes import router as job_router
+from app.services.job_manager import job_manager
+from app.llm_providers.http_pool import http_pool
+from app.llm_providers.ollama_context import conversation_contexts
+from app.llm_providers.ollama_keepalive import ollama_keepalive
+from app.llm_providers.cache import cache_bypass, response_cache
+from app.tools.research_cache import research_cache
+from app.services.semantic_cache import semantic_cache
+from app.utils.cassette import cassette
+from app.services.llm_service import llm_service
+from app.config.settings import settings
+from app.utils.tracing import trace_scope
+from app.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, render_metrics
 
 # ----------------------------
 # Logging Setup
@@ -34,8 +50,14 @@ logger = logging.getLogger("humind")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 HUMIND System Starting...")
+    job_manager.start()
+    # Preload the Ollama model in the background; /health/ready reports progress
+    ollama_keepalive.start()
     yield
     logger.info("🛑 HUMIND System Shutting Down...")
+    job_manager.shutdown()
+    await ollama_keepalive.shutdown()
+    await http_pool.aclose()
 
 
 # ----------------------------
@@ -49,6 +71,61 @@ app = FastAPI(
 )
 
 
+# ----------------------------
+# LLM Cache Bypass (debugging)
+# ----------------------------
+@app.middleware("http")
+async def llm_cache_bypass(request: Request, call_next):
+    bypass = request.headers.get(settings.llm_cache_bypass_header, "").lower() in ("1", "true", "yes")
+    token = cache_bypass.set(bypass)
+    try:
+        return await call_next(request)
+    finally:
+        cache_bypass.reset(token)
+
+
+# ----------------------------
+# Request Tracing (Server-Timing)
+# ----------------------------
+@app.middleware("http")
+async def request_tracing(request: Request, call_next):
+    if not settings.tracing_enabled:
+        return await call_next(request)
+
+    include_in_body = request.headers.get(settings.trace_body_header, "").lower() in ("1", "true", "yes")
+    with trace_scope(include_in_body=include_in_body) as trace:
+        response = await call_next(request)
+        # Streaming responses only cover the work done before the first byte
+        response.headers["Server-Timing"] = trace.server_timing()
+        return response
+
+
+# ----------------------------
+# Request Metrics (/metrics)
+# ----------------------------
+def _route_template(request: Request) -> str:
+    """Matched route template (e.g. /jobs/{job_id}); raw paths would explode label cardinality."""
+    # Newer FastAPI keeps the prefixed template of included routers here
+    route = request.scope.get("fastapi", {}).get("effective_route_context") or request.scope.get("route")
+    return getattr(route, "path_format", None) or "unmatched"
+
+
+@app.middleware("http")
+async def request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        HTTP_REQUEST_DURATION.labels(
+            request.method, _route_template(request), str(status)
+        ).observe(time.perf_counter() - start)
+
+
 # ----------------------------
 # Include Routers (FIXED)
 # ----------------------------
@@ -71,6 +148,9 @@ app.include_router(evaluation_router, prefix="/evaluation")
 # Memory-Enabled Chat
 app.include_router(memory_router, prefix="/chat")
 
+# Background Jobs (long research / summary runs)
+app.include_router(job_router, prefix="/jobs")
+
 # 🎟 Ticket Booking Agent
 app.include_router(booking_router, prefix="/booking", tags=["Booking Agent"])
 
@@ -85,6 +165,48 @@ def health_check():
     }
 
 
+@app.get("/health/cache", tags=["Health"])
+def cache_stats():
+    return {
+        "llm": response_cache.stats(),
+        "research": research_cache.stats(),
+        "semantic": semantic_cache.stats(),
+        "cassette": cassette.stats(),
+        "ollama_context": conversation_contexts.stats()
+    }
+
+
+@app.get("/health/llm", tags=["Health"])
+def llm_health():
+    return llm_service.provider_health()
+
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness(response: Response):
+    """Readiness probe: 503 while Ollama is the provider and its model is not loaded."""
+    report = await ollama_keepalive.readiness()
+    if not report["ready"]:
+        response.status_code = 503
+    return report
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.delete("/cache/semantic", tags=["Health"])
+def invalidate_semantic_cache(mode: Optional[str] = None, provider: Optional[str] = None):
+    """Drop cached graph answers, optionally for one mode and/or provider."""
+    if mode is not None and mode not in settings.semantic_cache_modes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown mode '{mode}'; cached modes are {settings.semantic_cache_modes}"
+        )
+    return {"removed": semantic_cache.invalidate(mode=mode, provider=provider)}
+
+
 # ----------------------------
 # Run Server
 # ----------------------------
@@ -0,0 +1,47 @@
+import requests
+from prometheus_client.parser import text_string_to_metric_families
+
+BASE_URL = "http://localhost:8000"
+
+EXPECTED_FAMILIES = [
+    "humind_http_request_duration_seconds",
+    "humind_http_requests_in_flight",
+    "humind_llm_request_duration_seconds",
+    "humind_graph_stage_duration_seconds",
+    "humind_cache_lookups",
+]
+
+def generate_traffic():
+    print("\n--- Generating Traffic ---")
+    requests.get(f"{BASE_URL}/")
+    for _ in range(2):
+        response = requests.post(
+            f"{BASE_URL}/agent/chat",
+            json={"question": "Should a small team adopt Kubernetes?", "mode": "fast_chat"}
+        )
+        print(f"/agent/chat status: {response.status_code}")
+
+def scrape():
+    print("\n--- Scraping /metrics ---")
+    response = requests.get(f"{BASE_URL}/metrics")
+    print(f"Status: {response.status_code} | Content-Type: {response.headers.get('content-type')}")
+    families = {f.name: f for f in text_string_to_metric_families(response.text)}
+
+    for name in EXPECTED_FAMILIES:
+        status = "OK" if name in families else "MISSING"
+        print(f"{status:8} {name}")
+
+    routes = sorted({
+        s.labels.get("route") for s in families["humind_http_request_duration_seconds"].samples
+        if s.labels.get("route")
+    })
+    print(f"Routes observed: {routes}")
+    return all(name in families for name in EXPECTED_FAMILIES)
+
+if __name__ == "__main__":
+    try:
+        generate_traffic()
+        ok = scrape()
+        print("\n✅ Metrics scrape verified" if ok else "\n❌ Metrics scrape incomplete")
+    except Exception as e:
+        print(f"Error: {e}")